@@ -0,0 +1,175 @@
+"""Fleet-scale load benchmark for the Xiaomi Pet Air Purifier integration.
+
+Starts a Home Assistant instance per fleet size with N simulated purifiers
+and reports, as JSON:
+
+- event-loop lag (mean, p99 and max of a 50 ms sleep overshoot)
+- default executor queue depth (mean and max)
+- CPU time per fleet-wide poll cycle and per device poll
+- traced memory per device after setup
+- state writes per minute
+- peak number of purifiers polled at the same time
+
+Usage:
+    python benchmarks/fleet_load.py --devices 1 10 50 200 --duration 60
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+from harness import (
+    SimulatedPurifier,
+    async_add_purifiers,
+    async_start_hass,
+    coordinators,
+)
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+
+from custom_components.xiaomi_pet_purifier.polling import async_get_poll_scheduler
+
+LAG_PROBE_INTERVAL = 0.05
+
+
+class LoopMonitor:
+    """Sample event-loop lag and executor queue depth."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the monitor."""
+        self._hass = hass
+        self._task: asyncio.Task | None = None
+        self.lags: list[float] = []
+        self.queue_depths: list[int] = []
+
+    def _queue_depth(self) -> int:
+        executor = getattr(self._hass.loop, "_default_executor", None)
+        if executor is None:
+            return 0
+        return executor._work_queue.qsize()  # pylint: disable=protected-access
+
+    async def _run(self) -> None:
+        loop = self._hass.loop
+        while True:
+            started = loop.time()
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            self.lags.append(loop.time() - started - LAG_PROBE_INTERVAL)
+            self.queue_depths.append(self._queue_depth())
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._task = self._hass.loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+async def async_run(devices: int, duration: float, interval: float) -> dict[str, Any]:
+    """Run the benchmark for one fleet size."""
+    hass = await async_start_hass()
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    setup_started = time.monotonic()
+    await async_add_purifiers(hass, devices)
+    setup_seconds = time.monotonic() - setup_started
+    memory = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    fleet = coordinators(hass)
+    poll_scheduler = async_get_poll_scheduler(hass)
+    poll_scheduler.async_set_interval(interval)
+    poll_scheduler.max_active = 0
+    polls_before = sum(coordinator.device.requests for coordinator in fleet)
+
+    state_writes = 0
+
+    @callback
+    def _count_state_write(event: Event) -> None:
+        nonlocal state_writes
+        state_writes += 1
+
+    remove_listener = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_state_write)
+    monitor = LoopMonitor(hass)
+    monitor.start()
+
+    cpu_started = time.process_time()
+    await asyncio.sleep(duration)
+    cpu_seconds = time.process_time() - cpu_started
+
+    await monitor.stop()
+    remove_listener()
+    polls = sum(coordinator.device.requests for coordinator in fleet) - polls_before
+    await hass.async_stop()
+
+    cycles = polls / devices if devices else 0
+    return {
+        "devices": devices,
+        "duration_s": duration,
+        "poll_interval_s": interval,
+        "setup_s": setup_seconds,
+        "event_loop_lag_ms": {
+            "mean": statistics.fmean(monitor.lags) * 1000 if monitor.lags else 0.0,
+            "p99": _percentile(monitor.lags, 99) * 1000,
+            "max": max(monitor.lags, default=0.0) * 1000,
+        },
+        "executor_queue_depth": {
+            "mean": (
+                statistics.fmean(monitor.queue_depths) if monitor.queue_depths else 0.0
+            ),
+            "max": max(monitor.queue_depths, default=0),
+        },
+        "device_requests": polls,
+        "max_concurrent_polls": poll_scheduler.max_active,
+        "cpu_ms_per_poll_cycle": cpu_seconds * 1000 / cycles if cycles else None,
+        "cpu_ms_per_device_poll": cpu_seconds * 1000 / polls if polls else None,
+        "memory_bytes_per_device": memory / devices if devices else 0,
+        "state_writes_per_minute": state_writes * 60 / duration,
+    }
+
+
+def main() -> int:
+    """Run the benchmark for every requested fleet size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--interval", type=float, default=5.0)
+    parser.add_argument("--latency", type=float, default=SimulatedPurifier.latency)
+    parser.add_argument("--output", help="write results to this file")
+    args = parser.parse_args()
+
+    SimulatedPurifier.latency = args.latency
+    results = [
+        asyncio.run(async_run(devices, args.duration, args.interval))
+        for devices in args.devices
+    ]
+
+    report = json.dumps({"results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report + "\n")
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Shared helpers for running the integration against simulated purifiers.
+
+These benchmarks need a Home Assistant installation in the current
+environment. The integration is loaded from this checkout and every
+`miio.Device` it creates is replaced by a `SimulatedPurifier`.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import Any
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from homeassistant import bootstrap, config as conf_util  # noqa: E402
+from homeassistant import config_entries, loader  # noqa: E402
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_TOKEN  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.setup import async_setup_component  # noqa: E402
+
+import custom_components.xiaomi_pet_purifier as integration  # noqa: E402
+from custom_components.xiaomi_pet_purifier import config_flow  # noqa: E402
+from custom_components.xiaomi_pet_purifier.const import DOMAIN  # noqa: E402
+
+
+class SimulatedInfo:
+    """Subset of `miio.DeviceInfo` used by the integration."""
+
+    def __init__(self, host: str) -> None:
+        """Initialize the info."""
+        self.model = "xiaomi.airp.cpa5"
+        octets = [int(part) for part in host.split(".")]
+        self.mac_address = "02:00:" + ":".join(f"{octet:02x}" for octet in octets)
+
+
+class SimulatedPurifier:
+    """In-process stand-in for a CPA5 purifier speaking MIoT properties.
+
+    `latency` seconds of blocking sleep are spent per request, so executor
+    occupancy is comparable to talking to a real device on the LAN.
+    """
+
+    latency = 0.02
+
+    def __init__(self, host: str, token: str, *args: Any, **kwargs: Any) -> None:
+        """Initialize the purifier."""
+        self.host = host
+        self._lock = threading.Lock()
+        self._random = random.Random(host)
+        self._values: dict[tuple[int, int], Any] = {
+            (2, 1): True,
+            (2, 3): 0,
+            (3, 4): 12,
+            (4, 1): 87,
+            (4, 3): 1200,
+            (4, 4): 3100,
+            (6, 2): 2,
+            (7, 1): True,
+            (8, 1): False,
+            (9, 1): 5,
+        }
+        self.requests = 0
+
+    def info(self) -> SimulatedInfo:
+        """Return the device info."""
+        time.sleep(self.latency)
+        return SimulatedInfo(self.host)
+
+    def send(self, command: str, parameters: Any = None) -> Any:
+        """Answer a MIoT request."""
+        time.sleep(self.latency)
+        with self._lock:
+            self.requests += 1
+            if command == "get_properties":
+                pm25 = self._values[(3, 4)] + self._random.randint(-2, 2)
+                self._values[(3, 4)] = max(0, pm25)
+                return [
+                    {
+                        **prop,
+                        "code": 0,
+                        "value": self._values.get((prop["siid"], prop["piid"])),
+                    }
+                    for prop in parameters
+                ]
+            if command == "set_properties":
+                for prop in parameters:
+                    self._values[(prop["siid"], prop["piid"])] = prop["value"]
+                return [{**prop, "code": 0} for prop in parameters]
+        raise ValueError(f"Unsupported command {command}")
+
+
+def install_simulator(device_class: type = SimulatedPurifier) -> None:
+    """Make the integration create simulated purifiers."""
+    integration.Device = device_class
+    config_flow.Device = device_class
+
+
+def _free_port() -> int:
+    """Return a local TCP port that is not in use."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def async_start_hass() -> HomeAssistant:
+    """Start a minimal Home Assistant instance with this integration.
+
+    Only the core integrations and the HTTP server the websocket API needs
+    are set up. A full bootstrap would drop into recovery mode, which skips
+    custom integrations, whenever the frontend requirements are not
+    installed.
+    """
+    logging.basicConfig(level=logging.WARNING)
+    config_dir = tempfile.mkdtemp(prefix="xiaomi_pet_purifier_bench_")
+    os.symlink(
+        os.path.join(REPO_ROOT, "custom_components"),
+        os.path.join(config_dir, "custom_components"),
+    )
+
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    await conf_util.async_process_ha_core_config(hass, {})
+    for domain in bootstrap.CORE_INTEGRATIONS:
+        await async_setup_component(hass, domain, {})
+    await async_setup_component(hass, "http", {"http": {"server_port": _free_port()}})
+    await hass.async_start()
+    return hass
+
+
+async def async_add_purifiers(
+    hass: HomeAssistant, count: int, device_class: type = SimulatedPurifier
+) -> list[str]:
+    """Add `count` simulated purifiers through the config flow."""
+    install_simulator(device_class)
+
+    async def _add(index: int) -> str:
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": "user"},
+            data={
+                CONF_HOST: f"10.{index // 65536}.{index // 256 % 256}.{index % 256}",
+                CONF_TOKEN: f"{index:032x}",
+                CONF_NAME: f"Purifier {index}",
+            },
+        )
+        return result["result"].entry_id
+
+    entry_ids = await asyncio.gather(*(_add(index) for index in range(count)))
+    await hass.async_block_till_done()
+    return list(entry_ids)
+
+
+def coordinators(hass: HomeAssistant) -> list:
+    """Return the coordinators of all loaded purifiers."""
+    return [
+        coordinator
+        for coordinator in hass.data.get(DOMAIN, {}).values()
+        if isinstance(coordinator, integration.XiaomiPetAirPurifierCoordinator)
+    ]
@@ -0,0 +1,87 @@
+"""Memory benchmark for the Xiaomi Pet Air Purifier integration.
+
+Sets up N simulated purifiers (200 by default) with tracemalloc running and
+reports, as JSON, the bytes retained per purifier after setup and after a
+number of poll cycles, plus the largest allocation sites per purifier.
+
+Usage:
+    python benchmarks/memory.py --devices 200 --polls 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Any
+
+from harness import async_add_purifiers, async_start_hass, coordinators
+
+
+async def async_run(devices: int, polls: int, top: int) -> dict[str, Any]:
+    """Measure retained memory per purifier."""
+    hass = await async_start_hass()
+
+    gc.collect()
+    tracemalloc.start(10)
+    baseline = tracemalloc.take_snapshot()
+
+    await async_add_purifiers(hass, devices)
+    gc.collect()
+    after_setup = tracemalloc.get_traced_memory()[0]
+
+    for _ in range(polls):
+        await asyncio.gather(
+            *(coordinator.async_refresh() for coordinator in coordinators(hass))
+        )
+        await hass.async_block_till_done()
+    gc.collect()
+
+    snapshot = tracemalloc.take_snapshot()
+    after_polls = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    baseline_size = sum(stat.size for stat in baseline.statistics("filename"))
+    sites = snapshot.compare_to(baseline, "lineno")[:top]
+
+    await hass.async_stop()
+
+    return {
+        "devices": devices,
+        "polls": polls,
+        "bytes_per_purifier_after_setup": (after_setup - baseline_size) / devices,
+        "bytes_per_purifier_after_polls": (after_polls - baseline_size) / devices,
+        "top_sites": [
+            {
+                "site": str(stat.traceback[0]),
+                "bytes_per_purifier": stat.size_diff / devices,
+                "blocks_per_purifier": stat.count_diff / devices,
+            }
+            for stat in sites
+        ],
+    }
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=200)
+    parser.add_argument("--polls", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", help="write results to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(async_run(args.devices, args.polls, args.top))
+
+    report = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report + "\n")
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Trace replay benchmark for the Xiaomi Pet Air Purifier integration.
+
+Sets up one purifier in a throwaway Home Assistant instance whose device
+answers from a recorded trace (see "Recording a device trace" in the
+README), feeds the trace through its coordinator and entities and reports,
+as JSON, the CPU time and state writes it took.
+
+Usage:
+    python benchmarks/replay.py config/xiaomi_pet_purifier/<entry id>.trace
+    python benchmarks/replay.py <trace> --speed 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any
+
+from harness import SimulatedInfo, async_add_purifiers, async_start_hass, coordinators
+
+from custom_components.xiaomi_pet_purifier.polling import async_get_poll_scheduler
+from custom_components.xiaomi_pet_purifier.trace import (
+    TraceRecord,
+    TraceReplayDevice,
+    async_replay_trace,
+    read_trace,
+)
+
+# Keeps the scheduled polls out of the replay
+IDLE_POLL_INTERVAL = 365 * 24 * 60 * 60
+
+
+class ReplayPurifier(TraceReplayDevice):
+    """Replay device that can be added through the config flow."""
+
+    first_poll: TraceRecord | None = None
+
+    def __init__(self, host: str, token: str, *args: Any, **kwargs: Any) -> None:
+        """Initialize the device, answering the first refresh from the trace."""
+        super().__init__(self.first_poll)
+        self.host = host
+
+    def info(self) -> SimulatedInfo:
+        """Return the device info."""
+        return SimulatedInfo(self.host)
+
+
+async def async_run(path: str, speed: float | None) -> dict[str, Any]:
+    """Replay a trace into a fresh instance."""
+    ReplayPurifier.first_poll = next(
+        (
+            record
+            for record in read_trace(path)
+            if record.method == "get_properties" and not record.error
+        ),
+        None,
+    )
+    if ReplayPurifier.first_poll is None:
+        raise SystemExit(f"{path} has no successful poll to set up the purifier")
+
+    hass = await async_start_hass()
+    await async_add_purifiers(hass, 1, ReplayPurifier)
+    async_get_poll_scheduler(hass).async_set_interval(IDLE_POLL_INTERVAL)
+
+    result = await async_replay_trace(coordinators(hass)[0], path, speed)
+
+    await hass.async_stop()
+    return {"trace": path, "speed": speed, **result}
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", help="trace file recorded by the integration")
+    parser.add_argument(
+        "--speed", type=float, help="divide recorded gaps by this (default: no gaps)"
+    )
+    parser.add_argument("--output", help="write results to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(async_run(args.trace, args.speed))
+
+    report = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report + "\n")
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
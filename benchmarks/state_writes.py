@@ -0,0 +1,109 @@
+"""State write micro-benchmark for the Xiaomi Pet Air Purifier integration.
+
+Sets up N simulated purifiers and times `async_write_ha_state` of every
+entity, grouped by platform, and reports as JSON the mean microseconds per
+write:
+
+- after the coordinator published a new data snapshot (derived state is
+  computed once for the new version)
+- when the same snapshot is written again (derived state comes from the
+  per-version cache)
+
+Usage:
+    python benchmarks/state_writes.py --devices 10 --rounds 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict
+from typing import Any
+
+from harness import async_add_purifiers, async_start_hass, coordinators
+
+from homeassistant.helpers.entity_platform import async_get_platforms
+
+from custom_components.xiaomi_pet_purifier.const import DOMAIN
+from custom_components.xiaomi_pet_purifier.models import PurifierData
+
+
+def _publish_snapshot(coordinator, round_index: int) -> None:
+    """Publish a new snapshot without notifying the entities."""
+    values = coordinator.data.as_dict()
+    values["pm25"] = round_index % 50
+    coordinator.data = PurifierData(values, coordinator.data.version + 1)
+
+
+async def async_run(devices: int, rounds: int) -> dict[str, Any]:
+    """Time state writes per platform."""
+    hass = await async_start_hass()
+    await async_add_purifiers(hass, devices)
+
+    entities = defaultdict(list)
+    for platform in async_get_platforms(hass, DOMAIN):
+        entities[platform.domain].extend(platform.entities.values())
+    fleet = coordinators(hass)
+
+    fresh: dict[str, float] = defaultdict(float)
+    cached: dict[str, float] = defaultdict(float)
+    perf_counter = time.perf_counter
+
+    for round_index in range(rounds):
+        for coordinator in fleet:
+            _publish_snapshot(coordinator, round_index)
+
+        for totals in (fresh, cached):
+            for domain, domain_entities in entities.items():
+                started = perf_counter()
+                for entity in domain_entities:
+                    entity.async_write_ha_state()
+                totals[domain] += perf_counter() - started
+
+    await hass.async_block_till_done()
+    await hass.async_stop()
+
+    total = sum(len(domain_entities) for domain_entities in entities.values())
+
+    def _per_write(totals: dict[str, float], domain: str) -> float:
+        return totals[domain] * 1e6 / (rounds * len(entities[domain]))
+
+    return {
+        "devices": devices,
+        "rounds": rounds,
+        "platforms": {
+            domain: {
+                "entities": len(domain_entities),
+                "us_per_write_new_snapshot": _per_write(fresh, domain),
+                "us_per_write_same_snapshot": _per_write(cached, domain),
+            }
+            for domain, domain_entities in sorted(entities.items())
+        },
+        "us_per_write_new_snapshot_all_platforms": (
+            sum(fresh.values()) * 1e6 / (rounds * total)
+        ),
+    }
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--output", help="write results to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(async_run(args.devices, args.rounds))
+
+    report = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report + "\n")
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
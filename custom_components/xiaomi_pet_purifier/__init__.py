@@ -1,7 +1,9 @@
 """Xiaomi Pet Air Purifier integration."""
+import asyncio
 import logging
+import time
 import warnings
-from datetime import timedelta
+from typing import Any
 
 # Suppress python-miio FutureWarning related to Python 3.13
 warnings.filterwarnings(
@@ -11,35 +13,45 @@ warnings.filterwarnings(
     message=".*functools.partial will be a method descriptor.*",
 )
 
-from miio import Device, DeviceException
+from miio import Device, DeviceError, DeviceException
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_TOKEN, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_TOKEN, Platform
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .aggregate import AreaAggregate
+from .command_queue import OfflineCommandQueue
 from .const import (
+    CONF_ENTRY_TYPE,
+    CONF_MEMBERS,
+    COMMAND_QUEUE_MAX_AGE,
+    CONF_TRACE,
     DOMAIN,
-    PIID_ALARM,
-    PIID_BRIGHTNESS,
-    PIID_CHILD_LOCK,
-    PIID_FAN_LEVEL,
-    PIID_FILTER_LEFT_TIME,
-    PIID_FILTER_LIFE,
-    PIID_FILTER_USED_TIME,
-    PIID_MODE,
-    PIID_PM25,
-    PIID_POWER,
-    SCAN_INTERVAL,
-    SIID_AIR_PURIFIER,
-    SIID_ALARM,
-    SIID_ENVIRONMENT,
-    SIID_FAVORITE,
-    SIID_FILTER,
-    SIID_PHYSICAL_CONTROLS,
-    SIID_SCREEN,
+    ENTRY_TYPE_GROUP,
+    EVENT_PET_ACTIVITY,
+    MODE_DEPENDENT_PROPERTIES,
+    OPTIMISTIC_TIMEOUT,
+    PROPERTIES,
+    SIGNAL_PURIFIER_LOADED,
+    SIGNAL_PURIFIER_UNLOADED,
+    SLOW_POLL_INTERVAL,
+    SLOW_PROPERTIES,
+    TRACE_DIR,
 )
+from .detector import Pm25SpikeDetector
+from .models import PurifierData
+from .polling import async_get_poll_scheduler
+from .scheduler import PRIORITY_COMMAND, PRIORITY_POLL, DeviceRequestScheduler
+from .stream import Pm25Stream, async_setup_websocket
+from .trace import TraceRecorder
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -51,9 +63,21 @@ PLATFORMS = [
     Platform.SELECT,
 ]
 
+GROUP_PLATFORMS = [Platform.SENSOR]
+
+
+def _platforms(entry: ConfigEntry) -> list[Platform]:
+    """Return the platforms of a config entry."""
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_GROUP:
+        return GROUP_PLATFORMS
+    return PLATFORMS
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Xiaomi Pet Air Purifier from a config entry."""
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_GROUP:
+        return await _async_setup_group_entry(hass, entry)
+
     host = entry.data[CONF_HOST]
     token = entry.data[CONF_TOKEN]
 
@@ -65,77 +89,341 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     except DeviceException as ex:
         raise ConfigEntryNotReady(f"Unable to connect to device: {ex}") from ex
 
+    # Record device I/O when enabled in the options
+    trace_recorder = None
+    if entry.options.get(CONF_TRACE, False):
+        trace_recorder = TraceRecorder(
+            hass.config.path(TRACE_DIR, f"{entry.entry_id}.trace")
+        )
+        await hass.async_add_executor_job(trace_recorder.open)
+
+        async def _async_close_trace() -> None:
+            await hass.async_add_executor_job(trace_recorder.close)
+
+        entry.async_on_unload(_async_close_trace)
+
     # Create coordinator
-    coordinator = XiaomiPetAirPurifierCoordinator(hass, device, entry)
+    coordinator = XiaomiPetAirPurifierCoordinator(
+        hass, device, entry, trace_recorder
+    )
+    entry.async_on_unload(coordinator.pm25_stream.async_shutdown)
+    entry.async_on_unload(coordinator.scheduler.async_shutdown)
+    await coordinator.command_queue.async_load()
     await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(coordinator.poll_scheduler.async_add(coordinator))
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_setup_websocket(hass)
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    # Groups hold on to member coordinators, attach them to the new one
+    async_dispatcher_send(hass, SIGNAL_PURIFIER_LOADED, entry.entry_id, coordinator)
+
+    return True
+
+
+async def _async_setup_group_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up area-level aggregates over a group of purifiers.
+
+    Members that are not loaded are left out until they are set up.
+    """
+    member_ids = []
+    names = []
+    for member_id in entry.data[CONF_MEMBERS]:
+        if (member := hass.config_entries.async_get_entry(member_id)) is None:
+            continue
+        member_ids.append(member_id)
+        names.append(member.title)
+
+    aggregate = AreaAggregate(member_ids, names)
+    for member_id, name in zip(member_ids, names):
+        if (coordinator := hass.data.get(DOMAIN, {}).get(member_id)) is None:
+            _LOGGER.debug("Purifier %s of %s is not loaded", name, entry.title)
+            continue
+        aggregate.async_attach(member_id, coordinator)
+    entry.async_on_unload(aggregate.async_stop)
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_PURIFIER_LOADED, aggregate.async_attach)
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_PURIFIER_UNLOADED, aggregate.async_detach
+        )
+    )
+
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][entry.entry_id] = aggregate
+
+    await hass.config_entries.async_forward_entry_setups(entry, GROUP_PLATFORMS)
 
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, _platforms(entry)
+    ):
         hass.data[DOMAIN].pop(entry.entry_id)
+        if entry.data.get(CONF_ENTRY_TYPE) != ENTRY_TYPE_GROUP:
+            # Detach the groups from the unloaded coordinator
+            async_dispatcher_send(hass, SIGNAL_PURIFIER_UNLOADED, entry.entry_id)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Clean up after a removed purifier."""
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_GROUP:
+        return
+
+    await OfflineCommandQueue(hass, entry.entry_id).async_remove()
+
+    for group in hass.config_entries.async_entries(DOMAIN):
+        if entry.entry_id in (members := group.data.get(CONF_MEMBERS, [])):
+            hass.config_entries.async_update_entry(
+                group,
+                data={
+                    **group.data,
+                    CONF_MEMBERS: [
+                        member_id
+                        for member_id in members
+                        if member_id != entry.entry_id
+                    ],
+                },
+            )
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+class PendingWrite:
+    """Optimistic value written to the device but not yet seen in a poll."""
+
+    __slots__ = ("value", "expires", "confirmed_version")
+
+    def __init__(self, value: Any, expires: float) -> None:
+        """Initialize the pending write."""
+        self.value = value
+        self.expires = expires
+        self.confirmed_version: int | None = None
+
+
 class XiaomiPetAirPurifierCoordinator(DataUpdateCoordinator):
     """Coordinator to manage data updates."""
 
     def __init__(
-        self, hass: HomeAssistant, device: Device, entry: ConfigEntry
+        self,
+        hass: HomeAssistant,
+        device: Device,
+        entry: ConfigEntry,
+        trace_recorder: TraceRecorder | None = None,
     ) -> None:
         """Initialize coordinator."""
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=SCAN_INTERVAL),
+            # Polls are staggered across the fleet by the poll scheduler
+            update_interval=None,
         )
         self.device = device
         self.entry = entry
+        self.device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": entry.data.get(CONF_NAME, "Pet Air Purifier"),
+            "manufacturer": "Xiaomi",
+            "model": "Smart Pet Care Air Purifier (CPA5)",
+        }
+        self.trace_recorder = trace_recorder
+        self.scheduler = DeviceRequestScheduler(hass, self.send)
+        self.poll_scheduler = async_get_poll_scheduler(hass)
+        self.pm25_stream = Pm25Stream(self)
+        self.command_queue = OfflineCommandQueue(hass, entry.entry_id)
+        self._replay: asyncio.Task | None = None
+        self._version = 0
+        self._data_version = 0
+        self._polled: dict[str, Any] = {}
+        self._slow_polled: dict[str, float] = {}
+        self._pending: dict[str, PendingWrite] = {}
+        self._consumers: dict[str, int] = {}
+        self._spike_detector = Pm25SpikeDetector()
+
+    def send(self, method: str, params: Any) -> Any:
+        """Send a request to the device (runs in executor).
+
+        Only called by the scheduler. All device traffic goes through here
+        so it can be traced.
+        """
+        if self.trace_recorder is None:
+            return self.device.send(method, params)
+
+        timestamp = time.time()
+        started = time.monotonic()
+        try:
+            response = self.device.send(method, params)
+        except DeviceException as ex:
+            self.trace_recorder.record(
+                timestamp, time.monotonic() - started, method, params, str(ex), True
+            )
+            raise
+
+        self.trace_recorder.record(
+            timestamp, time.monotonic() - started, method, params, response
+        )
+        return response
+
+    @callback
+    def async_add_consumer(self, *keys: str) -> CALLBACK_TYPE:
+        """Add properties to the poll set until the returned callback is called."""
+        missing = False
+        for key in keys:
+            self._consumers[key] = self._consumers.get(key, 0) + 1
+            missing |= key not in self._polled
+
+        if missing and self._polled:
+            self.hass.async_create_task(self.async_request_refresh())
+
+        @callback
+        def _remove_consumer() -> None:
+            for key in keys:
+                self._consumers[key] -= 1
+                if not self._consumers[key]:
+                    del self._consumers[key]
+
+        return _remove_consumer
+
+    @callback
+    def _poll_keys(self) -> tuple[list[str], list[str]]:
+        """Return the properties to poll and those to poll only after a mode change.
+
+        Before any entity has subscribed every property is polled.
+        """
+        if not self._consumers:
+            return list(PROPERTIES), []
+
+        mode = self.data.get("mode") if self.data else None
+        now = time.monotonic()
+        keys = []
+        deferred = []
+        for key in PROPERTIES:
+            if key != "mode" and key not in self._consumers:
+                continue
+            if (
+                key in SLOW_PROPERTIES
+                and key in self._polled
+                and now - self._slow_polled.get(key, 0.0) < SLOW_POLL_INTERVAL
+            ):
+                continue
+            required_mode = MODE_DEPENDENT_PROPERTIES.get(key)
+            if (
+                required_mode is not None
+                and mode != required_mode
+                and key in self._polled
+            ):
+                deferred.append(key)
+            else:
+                keys.append(key)
+        return keys, deferred
 
     async def _async_update_data(self):
         """Fetch data from device."""
+        self._version += 1
+        poll_version = self._version
+        keys, deferred = self._poll_keys()
+
         try:
-            return await self.hass.async_add_executor_job(self._get_data)
+            data = await self.async_get_properties(keys)
+
+            # The mode changed on the device, fetch what the new mode needs
+            if needed := [
+                key
+                for key in deferred
+                if data.get("mode") == MODE_DEPENDENT_PROPERTIES[key]
+            ]:
+                data.update(await self.async_get_properties(needed))
         except DeviceException as ex:
             raise UpdateFailed(f"Error communicating with device: {ex}") from ex
 
-    def _get_data(self):
-        """Get data from device (runs in executor)."""
-        properties = [
-            {"did": "power", "siid": SIID_AIR_PURIFIER, "piid": PIID_POWER},
-            {"did": "mode", "siid": SIID_AIR_PURIFIER, "piid": PIID_MODE},
-            {"did": "pm25", "siid": SIID_ENVIRONMENT, "piid": PIID_PM25},
-            {"did": "filter_life", "siid": SIID_FILTER, "piid": PIID_FILTER_LIFE},
-            {
-                "did": "filter_used_time",
-                "siid": SIID_FILTER,
-                "piid": PIID_FILTER_USED_TIME,
-            },
-            {
-                "did": "filter_left_time",
-                "siid": SIID_FILTER,
-                "piid": PIID_FILTER_LEFT_TIME,
-            },
-            {"did": "brightness", "siid": SIID_SCREEN, "piid": PIID_BRIGHTNESS},
-            {"did": "alarm", "siid": SIID_ALARM, "piid": PIID_ALARM},
+        # Keep the last value of subscribed properties not polled this time
+        if self._consumers:
+            self._polled = {
+                key: value
+                for key, value in self._polled.items()
+                if key in self._consumers
+            }
+        self._polled.update(data)
+        now = time.monotonic()
+        for key in SLOW_PROPERTIES:
+            if key in data:
+                self._slow_polled[key] = now
+
+        if "pm25" in data:
+            self.async_add_pm25_sample(data["pm25"])
+
+        # The device answered, send what was queued while it was unreachable
+        if self._replay is None and self.command_queue.async_values():
+            self._replay = self.hass.async_create_task(
+                self._async_replay_commands()
+            )
+
+        return self._merge_pending(poll_version)
+
+    async def _async_replay_commands(self) -> None:
+        """Send the queued commands to the device as one batch."""
+        values = self.command_queue.async_values()
+        _LOGGER.info(
+            "%s is reachable again, sending queued %s",
+            self.entry.title,
+            ", ".join(values),
+        )
+        try:
+            await self.async_set_properties(values, replayed=True)
+        except DeviceError as ex:
+            _LOGGER.error("Device rejected queued commands %s: %s", values, ex)
+            self.command_queue.async_discard(values, time.time())
+        finally:
+            self._replay = None
+
+    @callback
+    def async_add_pm25_sample(self, value: float | None) -> None:
+        """Feed a PM2.5 sample to the pet activity detector."""
+        if value is None:
+            return
+        if (event := self._spike_detector.update(value, time.time())) is None:
+            return
+
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, self.entry.entry_id)}
+        )
+        self.hass.bus.async_fire(
+            EVENT_PET_ACTIVITY,
             {
-                "did": "child_lock",
-                "siid": SIID_PHYSICAL_CONTROLS,
-                "piid": PIID_CHILD_LOCK,
+                "device_id": device.id if device else None,
+                "entry_id": self.entry.entry_id,
+                "onset": dt_util.utc_from_timestamp(event.onset).isoformat(),
+                "magnitude": round(event.magnitude, 1),
+                "pm25": event.value,
+                "baseline": round(event.baseline, 1),
             },
-            {"did": "fan_level", "siid": SIID_FAVORITE, "piid": PIID_FAN_LEVEL},
+        )
+
+    async def async_get_properties(self, keys: list[str]) -> dict[str, Any]:
+        """Get properties from device."""
+        properties = [
+            {"did": key, "siid": PROPERTIES[key][0], "piid": PROPERTIES[key][1]}
+            for key in keys
         ]
 
-        response = self.device.send("get_properties", properties)
+        response = await self.scheduler.async_request(
+            "get_properties", properties, PRIORITY_POLL
+        )
 
         data = {}
         for item in response:
@@ -143,3 +431,91 @@ class XiaomiPetAirPurifierCoordinator(DataUpdateCoordinator):
                 data[item["did"]] = item["value"]
 
         return data
+
+    @callback
+    def _merge_pending(self, poll_version: int | None = None) -> PurifierData:
+        """Overlay pending writes on the polled snapshot.
+
+        A pending write is dropped once a poll that started after the device
+        acknowledged it comes back, or when it expires. The current snapshot
+        is kept when nothing changed, otherwise the new one gets the next
+        data version.
+        """
+        now = time.monotonic()
+        values = dict(self._polled)
+        for did, pending in list(self._pending.items()):
+            if now >= pending.expires or (
+                poll_version is not None
+                and pending.confirmed_version is not None
+                and poll_version > pending.confirmed_version
+            ):
+                del self._pending[did]
+            else:
+                values[did] = pending.value
+
+        data = PurifierData(values)
+        if data == self.data:
+            return self.data
+        self._data_version += 1
+        data.version = self._data_version
+        return data
+
+    async def async_set_properties(
+        self, values: dict[str, Any], replayed: bool = False
+    ) -> None:
+        """Write properties to the device with optimistic feedback.
+
+        If the device is unreachable the values are queued and sent when it
+        answers again; `replayed` values are already queued and keep their
+        age. Raises DeviceException after rolling back if the device rejects
+        the write.
+        """
+        started = time.time()
+        expires = time.monotonic() + OPTIMISTIC_TIMEOUT
+        writes = {did: PendingWrite(value, expires) for did, value in values.items()}
+        self._pending.update(writes)
+        self.data = self._merge_pending()
+        self.async_update_listeners()
+
+        try:
+            await self.scheduler.async_request(
+                "set_properties",
+                [
+                    {
+                        "did": did,
+                        "siid": PROPERTIES[did][0],
+                        "piid": PROPERTIES[did][1],
+                        "value": value,
+                    }
+                    for did, value in values.items()
+                ],
+                PRIORITY_COMMAND,
+            )
+        except DeviceError:
+            # Roll back writes that have not been superseded
+            for did, pending in writes.items():
+                if self._pending.get(did) is pending:
+                    del self._pending[did]
+            self.data = self._merge_pending()
+            self.async_update_listeners()
+            raise
+        except DeviceException as ex:
+            # Keep showing the desired state until the queue replays it
+            _LOGGER.warning(
+                "%s is unreachable, queued %s until it is back: %s",
+                self.entry.title,
+                ", ".join(values),
+                ex,
+            )
+            if not replayed:
+                self.command_queue.async_add(values)
+            for pending in writes.values():
+                pending.expires = time.monotonic() + COMMAND_QUEUE_MAX_AGE
+            return
+
+        self.command_queue.async_discard(values, started)
+        self._version += 1
+        for pending in writes.values():
+            pending.confirmed_version = self._version
+
+        await self.async_request_refresh()
@@ -0,0 +1,170 @@
+"""Area-level PM2.5 aggregates over a group of Xiaomi Pet Air Purifiers."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import partial
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import AGGREGATE_VECTORIZE_THRESHOLD
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class AreaAggregate:
+    """Running PM2.5 mean, maximum and worst device of a purifier group.
+
+    Each member sample updates the aggregates in O(1). The maximum is only
+    rescanned when the current worst device improves, which uses numpy for
+    large groups when it is available.
+
+    Members are attached and detached as their purifiers are set up and
+    unloaded, so the group keeps running while its members come and go.
+    """
+
+    def __init__(self, member_ids: list[str], names: list[str]) -> None:
+        """Initialize the aggregate."""
+        self._index = {member_id: index for index, member_id in enumerate(member_ids)}
+        self._names = names
+        self._coordinators: list = [None] * len(member_ids)
+        self._values: list[float | None] = [None] * len(member_ids)
+        self._sum = 0.0
+        self._count = 0
+        self._max_index: int | None = None
+        self._array = None
+        if np is not None and len(member_ids) >= AGGREGATE_VECTORIZE_THRESHOLD:
+            self._array = np.full(len(member_ids), np.nan)
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._unsubscribe: dict[int, list[CALLBACK_TYPE]] = {}
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean PM2.5 of members with a value."""
+        if not self._count:
+            return None
+        return round(self._sum / self._count, 1)
+
+    @property
+    def max(self) -> float | None:
+        """Return the highest PM2.5 of the group."""
+        if self._max_index is None:
+            return None
+        return self._values[self._max_index]
+
+    @property
+    def worst_device(self) -> str | None:
+        """Return the name of the member with the highest PM2.5."""
+        if self._max_index is None:
+            return None
+        return self._names[self._max_index]
+
+    @callback
+    def async_attach(self, member_id: str, coordinator) -> None:
+        """Start aggregating a member that was set up."""
+        if (index := self._index.get(member_id)) is None:
+            return
+        self._async_unsubscribe(index)
+        self._coordinators[index] = coordinator
+        self._unsubscribe[index] = [
+            coordinator.async_add_consumer("pm25"),
+            coordinator.async_add_listener(
+                partial(self._async_member_updated, index)
+            ),
+        ]
+        self._async_member_updated(index)
+
+    @callback
+    def async_detach(self, member_id: str) -> None:
+        """Leave out a member that was unloaded."""
+        if (index := self._index.get(member_id)) is None:
+            return
+        self._async_unsubscribe(index)
+        self._coordinators[index] = None
+        self._async_member_updated(index)
+
+    @callback
+    def async_stop(self) -> None:
+        """Unsubscribe from the member coordinators."""
+        for index in list(self._unsubscribe):
+            self._async_unsubscribe(index)
+
+    @callback
+    def _async_unsubscribe(self, index: int) -> None:
+        """Unsubscribe from the coordinator of a member."""
+        for unsubscribe in self._unsubscribe.pop(index, ()):
+            unsubscribe()
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Listen for aggregate changes."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def _remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return _remove_listener
+
+    @staticmethod
+    def _member_value(coordinator) -> float | None:
+        """Return the PM2.5 of a member, or None while it is unavailable."""
+        if (
+            coordinator is None
+            or not coordinator.last_update_success
+            or not coordinator.data
+        ):
+            return None
+        return coordinator.data.get("pm25")
+
+    @callback
+    def _async_member_updated(self, index: int) -> None:
+        """Handle a new sample from a member."""
+        if self._update(index, self._member_value(self._coordinators[index])):
+            for update_callback in list(self._listeners):
+                update_callback()
+
+    def _update(self, index: int, value: float | None) -> bool:
+        """Replace the sample of a member, return True if it changed."""
+        old = self._values[index]
+        if value == old:
+            return False
+
+        self._values[index] = value
+        if self._array is not None:
+            self._array[index] = np.nan if value is None else value
+
+        if old is not None:
+            self._sum -= old
+            self._count -= 1
+        if value is not None:
+            self._sum += value
+            self._count += 1
+
+        max_index = self._max_index
+        if index == max_index:
+            if value is None or value < old:
+                self._rescan_max()
+        elif value is not None and (
+            max_index is None or value > self._values[max_index]
+        ):
+            self._max_index = index
+
+        return True
+
+    def _rescan_max(self) -> None:
+        """Find the worst member from scratch."""
+        if not self._count:
+            self._max_index = None
+        elif self._array is not None:
+            self._max_index = int(np.nanargmax(self._array))
+        else:
+            values = self._values
+            self._max_index = max(
+                (index for index, value in enumerate(values) if value is not None),
+                key=values.__getitem__,
+            )
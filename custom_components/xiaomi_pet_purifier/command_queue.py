@@ -0,0 +1,88 @@
+"""Durable queue of commands for unreachable Xiaomi Pet Air Purifiers."""
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    COMMAND_QUEUE_MAX_AGE,
+    COMMAND_QUEUE_SAVE_DELAY,
+    COMMAND_QUEUE_STORAGE_VERSION,
+    DOMAIN,
+)
+
+
+class OfflineCommandQueue:
+    """Desired property values waiting for the device to come back.
+
+    Writes to the same property coalesce to the last value, so a reconnect
+    replays the final desired state instead of every command that was missed.
+    Values older than COMMAND_QUEUE_MAX_AGE are dropped as stale.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the queue."""
+        self._store = Store(
+            hass, COMMAND_QUEUE_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.commands"
+        )
+        self._commands: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load queued commands from storage."""
+        if data := await self._store.async_load():
+            self._commands = data.get("commands", {})
+        self._async_expire()
+
+    async def async_remove(self) -> None:
+        """Delete the stored queue."""
+        await self._store.async_remove()
+
+    @callback
+    def async_values(self) -> dict[str, Any]:
+        """Return the queued values by property."""
+        self._async_expire()
+        return {key: command["value"] for key, command in self._commands.items()}
+
+    @callback
+    def async_add(self, values: dict[str, Any]) -> None:
+        """Queue values, replacing older values of the same properties."""
+        queued = time.time()
+        for key, value in values.items():
+            self._commands[key] = {"value": value, "queued": queued}
+        self._async_schedule_save()
+
+    @callback
+    def async_discard(self, keys: Iterable[str], before: float) -> None:
+        """Drop values of properties written after they were queued."""
+        changed = False
+        for key in keys:
+            if (command := self._commands.get(key)) and command["queued"] <= before:
+                del self._commands[key]
+                changed = True
+        if changed:
+            self._async_schedule_save()
+
+    @callback
+    def _async_expire(self) -> None:
+        """Drop stale commands."""
+        oldest = time.time() - COMMAND_QUEUE_MAX_AGE
+        stale = [
+            key
+            for key, command in self._commands.items()
+            if command["queued"] < oldest
+        ]
+        for key in stale:
+            del self._commands[key]
+        if stale:
+            self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the queue after a short delay."""
+        self._store.async_delay_save(
+            lambda: {"commands": self._commands}, COMMAND_QUEUE_SAVE_DELAY
+        )
@@ -1,4 +1,7 @@
 """Config flow for Xiaomi Pet Air Purifier integration."""
+import asyncio
+import contextlib
+import csv
 import logging
 from typing import Any
 
@@ -6,10 +9,29 @@ import voluptuous as vol
 from miio import Device, DeviceException
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST, CONF_NAME, CONF_TOKEN
-from homeassistant.data_entry_flow import FlowResult
+from homeassistant.const import (
+    CONF_DEVICES,
+    CONF_HOST,
+    CONF_MAC,
+    CONF_NAME,
+    CONF_TOKEN,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.data_entry_flow import FlowResult, FlowResultType
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
+from homeassistant.helpers.translation import async_get_translations
 
-from .const import DOMAIN, MODEL_CPA5
+from .const import (
+    CONF_ENTRY_TYPE,
+    CONF_MEMBERS,
+    CONF_TRACE,
+    DOMAIN,
+    ENTRY_TYPE_GROUP,
+    IMPORT_MAX_CONCURRENCY,
+    IMPORT_TIMEOUT,
+    MODEL_CPA5,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,16 +43,97 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+# miio's handshake always waits this long for the device to answer
+MIIO_HANDSHAKE_TIMEOUT = 5
+
+STEP_IMPORT_DATA_SCHEMA = vol.Schema(
+    {vol.Required(CONF_DEVICES): TextSelector(TextSelectorConfig(multiline=True))}
+)
+
+
+async def _async_device_info(
+    hass: HomeAssistant, host: str, token: str, timeout: float | None = None
+):
+    """Connect to a purifier and return its `miio.DeviceInfo`.
+
+    With a `timeout` the request gets what is left after the handshake and
+    is not retried, so the blocking call returns within `timeout`.
+    """
+    if timeout is None:
+        device = Device(host, token)
+    else:
+        device = Device(
+            host, token, timeout=max(1, int(timeout) - MIIO_HANDSHAKE_TIMEOUT)
+        )
+        device.retry_count = 0
+    info = await hass.async_add_executor_job(device.info)
+
+    # Check if model is supported
+    if info.model not in [MODEL_CPA5, "xiaomi.airp.cpa4"]:
+        _LOGGER.warning(
+            "Device model %s may not be fully supported. Expected %s",
+            info.model,
+            MODEL_CPA5,
+        )
+
+    return info
+
+
+def _parse_devices(text: str) -> list[list[str]]:
+    """Parse `host,token[,name]` lines, skipping blank and comment lines."""
+    return [
+        [field.strip() for field in row]
+        for row in csv.reader(text.splitlines())
+        if row and row[0].strip() and not row[0].lstrip().startswith("#")
+    ]
+
 
 class XiaomiPetAirPurifierConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Xiaomi Pet Air Purifier."""
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return XiaomiPetAirPurifierOptionsFlow(config_entry)
+
+    @classmethod
+    @callback
+    def async_supports_options_flow(
+        cls, config_entry: config_entries.ConfigEntry
+    ) -> bool:
+        """Return options flow support for this handler."""
+        return config_entry.data.get(CONF_ENTRY_TYPE) != ENTRY_TYPE_GROUP
+
+    @callback
+    def _async_purifiers(self) -> dict[str, str]:
+        """Return the titles of configured purifiers by entry id."""
+        return {
+            entry.entry_id: entry.title
+            for entry in self._async_current_entries(include_ignore=False)
+            if entry.data.get(CONF_ENTRY_TYPE) != ENTRY_TYPE_GROUP
+        }
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
+        if user_input is None:
+            menu_options = ["device", "bulk_import"]
+            if self._async_purifiers():
+                menu_options.append("group")
+            return self.async_show_menu(step_id="user", menu_options=menu_options)
+
+        return await self.async_step_device(user_input)
+
+    async def async_step_device(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Add a purifier."""
         errors = {}
 
         if user_input is not None:
@@ -38,18 +141,8 @@ class XiaomiPetAirPurifierConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             token = user_input[CONF_TOKEN]
 
             # Test connection
-            device = Device(host, token)
             try:
-                info = await self.hass.async_add_executor_job(device.info)
-                model = info.model
-
-                # Check if model is supported
-                if model not in [MODEL_CPA5, "xiaomi.airp.cpa4"]:
-                    _LOGGER.warning(
-                        "Device model %s may not be fully supported. Expected %s",
-                        model,
-                        MODEL_CPA5,
-                    )
+                info = await _async_device_info(self.hass, host, token)
 
                 # Check if already configured
                 await self.async_set_unique_id(info.mac_address)
@@ -71,7 +164,186 @@ class XiaomiPetAirPurifierConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "unknown"
 
         return self.async_show_form(
-            step_id="user",
+            step_id="device",
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Create the entry of a purifier validated by the bulk import."""
+        await self.async_set_unique_id(import_data[CONF_MAC])
+        self._abort_if_unique_id_configured()
+
+        return self.async_create_entry(
+            title=import_data[CONF_NAME],
+            data={
+                CONF_HOST: import_data[CONF_HOST],
+                CONF_TOKEN: import_data[CONF_TOKEN],
+                CONF_NAME: import_data[CONF_NAME],
+            },
+        )
+
+    async def async_step_bulk_import(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Add many purifiers from `host,token[,name]` lines.
+
+        All devices are validated concurrently, each with its own timeout, so
+        the import takes about as long as the slowest device. Every valid
+        purifier gets its own entry through an import flow.
+        """
+        errors = {}
+
+        if user_input is not None:
+            if rows := _parse_devices(user_input[CONF_DEVICES]):
+                return await self._async_import_devices(rows)
+            errors[CONF_DEVICES] = "no_devices"
+
+        return self.async_show_form(
+            step_id="bulk_import",
+            data_schema=STEP_IMPORT_DATA_SCHEMA,
+            errors=errors,
+        )
+
+    async def _async_import_devices(self, rows: list[list[str]]) -> FlowResult:
+        """Validate purifiers, create their entries and report the outcomes.
+
+        Every row is validated before any entry is created, so setting up
+        the new purifiers does not slow down the rows still being checked.
+        """
+        semaphore = asyncio.Semaphore(IMPORT_MAX_CONCURRENCY)
+
+        async def _async_validate(row: list[str]) -> Any:
+            """Return the device info of a row or the reason it failed."""
+            if len(row) not in (2, 3) or not row[0] or len(row[1]) != 32:
+                return "invalid_line"
+            host, token = row[0], row[1]
+
+            async with semaphore:
+                job = self.hass.async_create_task(
+                    _async_device_info(self.hass, host, token, IMPORT_TIMEOUT)
+                )
+                try:
+                    async with asyncio.timeout(IMPORT_TIMEOUT):
+                        return await asyncio.shield(job)
+                except TimeoutError:
+                    # Keep the slot until the executor job really returns
+                    with contextlib.suppress(Exception):
+                        await job
+                    return "cannot_connect"
+                except DeviceException:
+                    return "cannot_connect"
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Unexpected exception importing %s", host)
+                    return "unknown"
+
+        async def _async_create(row: list[str], info) -> str:
+            """Create the entry of a validated row."""
+            host, token = row[0], row[1]
+            result = await self.hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": config_entries.SOURCE_IMPORT},
+                data={
+                    CONF_HOST: host,
+                    CONF_TOKEN: token,
+                    CONF_NAME: row[2] if len(row) == 3 and row[2] else host,
+                    CONF_MAC: info.mac_address,
+                },
+            )
+            if result["type"] != FlowResultType.CREATE_ENTRY:
+                return result.get("reason", "not_added")
+            return "added"
+
+        outcomes = await asyncio.gather(*(_async_validate(row) for row in rows))
+
+        configured = self._async_current_ids()
+        seen: set[str] = set()
+        creates = {}
+        for index, (row, info) in enumerate(zip(rows, outcomes)):
+            if isinstance(info, str):
+                continue
+            if info.mac_address in configured or info.mac_address in seen:
+                outcomes[index] = "already_configured"
+                continue
+            seen.add(info.mac_address)
+            creates[index] = _async_create(row, info)
+        created = await asyncio.gather(*creates.values())
+        for index, outcome in zip(creates, created):
+            outcomes[index] = outcome
+
+        translations = await async_get_translations(
+            self.hass, self.hass.config.language, "selector", {DOMAIN}
+        )
+        prefix = f"component.{DOMAIN}.selector.import_outcome.options"
+
+        return self.async_abort(
+            reason="bulk_import_finished",
+            description_placeholders={
+                "added": str(outcomes.count("added")),
+                "total": str(len(rows)),
+                "results": "\n".join(
+                    f"- {row[0]}: {translations.get(f'{prefix}.{outcome}', outcome)}"
+                    for row, outcome in zip(rows, outcomes)
+                ),
+            },
+        )
+
+    async def async_step_group(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Add area-level aggregates over a group of purifiers."""
+        errors = {}
+        purifiers = self._async_purifiers()
+
+        if user_input is not None:
+            if not user_input[CONF_MEMBERS]:
+                errors[CONF_MEMBERS] = "no_members"
+            else:
+                return self.async_create_entry(
+                    title=user_input[CONF_NAME],
+                    data={
+                        CONF_ENTRY_TYPE: ENTRY_TYPE_GROUP,
+                        CONF_NAME: user_input[CONF_NAME],
+                        CONF_MEMBERS: list(user_input[CONF_MEMBERS]),
+                    },
+                )
+
+        return self.async_show_form(
+            step_id="group",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_NAME): str,
+                    vol.Required(CONF_MEMBERS, default=[]): cv.multi_select(
+                        purifiers
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
+
+class XiaomiPetAirPurifierOptionsFlow(config_entries.OptionsFlow):
+    """Handle options for Xiaomi Pet Air Purifier."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_TRACE,
+                        default=self._entry.options.get(CONF_TRACE, False),
+                    ): bool,
+                }
+            ),
+        )
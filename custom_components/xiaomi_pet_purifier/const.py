@@ -3,6 +3,12 @@ from typing import Final
 
 DOMAIN: Final = "xiaomi_pet_purifier"
 CONF_MODEL: Final = "model"
+CONF_TRACE: Final = "trace"
+CONF_ENTRY_TYPE: Final = "entry_type"
+CONF_MEMBERS: Final = "members"
+
+# Config entry types
+ENTRY_TYPE_GROUP: Final = "group"
 
 # Device models
 MODEL_CPA5: Final = "xiaomi.airp.cpa5"
@@ -10,6 +16,9 @@ MODEL_CPA5: Final = "xiaomi.airp.cpa5"
 # Update interval
 SCAN_INTERVAL: Final = 30  # seconds
 
+# Device I/O traces, relative to the config directory
+TRACE_DIR: Final = DOMAIN
+
 # MIoT service and property IDs
 SIID_AIR_PURIFIER: Final = 2
 PIID_POWER: Final = 1
@@ -35,11 +44,63 @@ PIID_CHILD_LOCK: Final = 1
 SIID_FAVORITE: Final = 9
 PIID_FAN_LEVEL: Final = 1
 
+# Properties by data key: (siid, piid)
+PROPERTIES: Final = {
+    "power": (SIID_AIR_PURIFIER, PIID_POWER),
+    "mode": (SIID_AIR_PURIFIER, PIID_MODE),
+    "pm25": (SIID_ENVIRONMENT, PIID_PM25),
+    "filter_life": (SIID_FILTER, PIID_FILTER_LIFE),
+    "filter_used_time": (SIID_FILTER, PIID_FILTER_USED_TIME),
+    "filter_left_time": (SIID_FILTER, PIID_FILTER_LEFT_TIME),
+    "brightness": (SIID_SCREEN, PIID_BRIGHTNESS),
+    "alarm": (SIID_ALARM, PIID_ALARM),
+    "child_lock": (SIID_PHYSICAL_CONTROLS, PIID_CHILD_LOCK),
+    "fan_level": (SIID_FAVORITE, PIID_FAN_LEVEL),
+}
+
+# Group size from which aggregates are rescanned with numpy
+AGGREGATE_VECTORIZE_THRESHOLD: Final = 64
+
+# Dispatched with the entry id and coordinator of a purifier set up or unloaded
+SIGNAL_PURIFIER_LOADED: Final = f"{DOMAIN}_purifier_loaded"
+SIGNAL_PURIFIER_UNLOADED: Final = f"{DOMAIN}_purifier_unloaded"
+
+# Pet activity detection from PM2.5 spikes
+EVENT_PET_ACTIVITY: Final = f"{DOMAIN}_pet_activity"
+SPIKE_BASELINE_TIME_CONSTANT: Final = 600  # seconds
+SPIKE_WINDOW: Final = 60  # seconds
+SPIKE_DRIFT: Final = 5  # µg/m³ above baseline ignored as noise
+SPIKE_THRESHOLD: Final = 20  # µg/m³ over one window
+SPIKE_RELEARN_TIME: Final = 1800  # seconds above baseline taken as a new level
+
+# High-rate PM2.5 websocket stream
+STREAM_POLL_INTERVAL: Final = 1  # seconds
+STREAM_FRAME_INTERVAL: Final = 1  # seconds
+
+# Bulk import
+IMPORT_MAX_CONCURRENCY: Final = 32
+IMPORT_TIMEOUT: Final = 10  # seconds
+
+# Commands queued while a purifier is unreachable
+COMMAND_QUEUE_STORAGE_VERSION: Final = 1
+COMMAND_QUEUE_SAVE_DELAY: Final = 1  # seconds
+COMMAND_QUEUE_MAX_AGE: Final = 12 * 60 * 60  # seconds
+
+# How long an unconfirmed optimistic write is shown
+OPTIMISTIC_TIMEOUT: Final = 10  # seconds
+
 # Modes
 MODE_AUTO: Final = 0
 MODE_SLEEP: Final = 1
 MODE_FAVORITE: Final = 2
 
+# Properties that are only polled while the device is in a given mode
+MODE_DEPENDENT_PROPERTIES: Final = {"fan_level": MODE_FAVORITE}
+
+# Hour counters that are polled at most this often
+SLOW_PROPERTIES: Final = ("filter_used_time", "filter_left_time")
+SLOW_POLL_INTERVAL: Final = 3600  # seconds
+
 PRESET_MODES: Final = ["Auto", "Sleep", "Favorite"]
 
 # Brightness levels
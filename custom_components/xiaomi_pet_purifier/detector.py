@@ -0,0 +1,99 @@
+"""Streaming PM2.5 spike detection for Xiaomi Pet Air Purifier."""
+from __future__ import annotations
+
+import math
+
+from .const import (
+    SPIKE_BASELINE_TIME_CONSTANT,
+    SPIKE_DRIFT,
+    SPIKE_RELEARN_TIME,
+    SPIKE_THRESHOLD,
+    SPIKE_WINDOW,
+)
+
+
+class SpikeEvent:
+    """A detected PM2.5 rise."""
+
+    __slots__ = ("onset", "magnitude", "baseline", "value")
+
+    def __init__(
+        self, onset: float, magnitude: float, baseline: float, value: float
+    ) -> None:
+        """Initialize the event."""
+        self.onset = onset
+        self.magnitude = magnitude
+        self.baseline = baseline
+        self.value = value
+
+
+class Pm25SpikeDetector:
+    """Detect sharp PM2.5 rises with an EWMA baseline and a one-sided CUSUM.
+
+    Both the baseline and the CUSUM are weighted by the time between samples,
+    so detection behaves the same at any poll rate. Each sample costs O(1)
+    and no history is kept. The CUSUM is capped at the threshold so it falls
+    back quickly after a spike, and a rise that lasts longer than
+    `relearn_time` is taken as a new background level.
+    """
+
+    def __init__(
+        self,
+        time_constant: float = SPIKE_BASELINE_TIME_CONSTANT,
+        window: float = SPIKE_WINDOW,
+        drift: float = SPIKE_DRIFT,
+        threshold: float = SPIKE_THRESHOLD,
+        relearn_time: float = SPIKE_RELEARN_TIME,
+    ) -> None:
+        """Initialize the detector."""
+        self._time_constant = time_constant
+        self._window = window
+        self._drift = drift
+        self._threshold = threshold
+        self._relearn_time = relearn_time
+        self.baseline: float | None = None
+        self._cusum = 0.0
+        self._last: float | None = None
+        self._onset: float | None = None
+        self._fired = False
+
+    def update(self, value: float, timestamp: float) -> SpikeEvent | None:
+        """Add a sample, return an event when a spike is detected."""
+        if self.baseline is None or self._last is None:
+            self.baseline = value
+            self._last = timestamp
+            return None
+
+        # Gaps longer than the window (device offline) count as one window
+        elapsed = min(max(timestamp - self._last, 0.0), self._window)
+        self._last = timestamp
+
+        deviation = value - self.baseline
+        self._cusum = min(
+            self._threshold,
+            max(0.0, self._cusum + (deviation - self._drift) * elapsed / self._window),
+        )
+
+        if not self._cusum:
+            # Back to normal, follow slow changes of the background level
+            self._onset = None
+            self._fired = False
+            alpha = 1 - math.exp(-elapsed / self._time_constant)
+            self.baseline += alpha * deviation
+            return None
+
+        if self._onset is None:
+            self._onset = timestamp
+        elif timestamp - self._onset >= self._relearn_time:
+            # Sustained shift of the background level, not a spike
+            self.baseline = value
+            self._cusum = 0.0
+            self._onset = None
+            self._fired = False
+            return None
+
+        if self._fired or self._cusum < self._threshold:
+            return None
+
+        self._fired = True
+        return SpikeEvent(self._onset, deviation, self.baseline, value)
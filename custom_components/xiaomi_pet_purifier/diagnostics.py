@@ -0,0 +1,41 @@
+"""Diagnostics support for Xiaomi Pet Air Purifier."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_TOKEN
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_ENTRY_TYPE, DOMAIN, ENTRY_TYPE_GROUP
+
+TO_REDACT = {CONF_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+    }
+
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_GROUP:
+        return diagnostics
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    diagnostics["data"] = coordinator.data.as_dict() if coordinator.data else None
+    diagnostics["last_update_success"] = coordinator.last_update_success
+    diagnostics["scheduler"] = coordinator.scheduler.stats
+    diagnostics["polling"] = {
+        **coordinator.poll_scheduler.stats,
+        "phase": coordinator.poll_scheduler.phase(entry.entry_id),
+    }
+    diagnostics["queued_commands"] = coordinator.command_queue.async_values()
+    diagnostics["pm25_stream_subscribers"] = coordinator.pm25_stream.subscribers
+
+    return diagnostics
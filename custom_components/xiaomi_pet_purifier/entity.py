@@ -0,0 +1,72 @@
+"""Base entity for Xiaomi Pet Air Purifier."""
+from collections.abc import Callable
+from functools import wraps
+from typing import Any, TypeVar
+
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+_T = TypeVar("_T")
+
+
+def derived_state(func: Callable[[Any], _T]) -> Callable[[Any], _T]:
+    """Compute a state property once per coordinator data version.
+
+    Home Assistant reads state properties several times per state write;
+    the value is cached on the entity until the coordinator publishes a
+    new snapshot.
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(self) -> _T:
+        version = self.coordinator.data.version
+        if self._derived_version != version:
+            self._derived_version = version
+            self._derived = {}
+        elif name in self._derived:
+            return self._derived[name]
+        value = self._derived[name] = func(self)
+        return value
+
+    return wrapper
+
+
+class XiaomiPetAirPurifierEntity(CoordinatorEntity):
+    """Base class for Xiaomi Pet Air Purifier entities.
+
+    Entities keep their shared, immutable description, the device info of
+    their coordinator and the derived state of the current data version.
+    """
+
+    _attr_has_entity_name = True
+    _derived_version: int | None = None
+    _derived: dict[str, Any]
+
+    # Controls stay available while the device is unreachable so that
+    # their commands reach the offline command queue
+    _queue_offline_commands = False
+
+    def __init__(self, coordinator, description: EntityDescription) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_{description.key}"
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        if self._queue_offline_commands:
+            return self.coordinator.data is not None
+        return super().available
+
+    @property
+    def _poll_keys(self) -> tuple[str, ...]:
+        """Return the coordinator data keys this entity reads."""
+        return (self.entity_description.key,)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe the properties this entity needs to the poll set."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_consumer(*self._poll_keys))
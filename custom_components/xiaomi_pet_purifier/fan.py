@@ -1,13 +1,16 @@
 """Fan platform for Xiaomi Pet Air Purifier."""
 import logging
+import math
 from typing import Any
 
-from homeassistant.components.fan import FanEntity, FanEntityFeature
+from homeassistant.components.fan import (
+    FanEntity,
+    FanEntityDescription,
+    FanEntityFeature,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util.percentage import (
     int_states_in_range,
     percentage_to_ranged_value,
@@ -21,18 +24,19 @@ from .const import (
     MODE_AUTO,
     MODE_FAVORITE,
     MODE_SLEEP,
-    PIID_FAN_LEVEL,
-    PIID_MODE,
-    PIID_POWER,
     PRESET_MODES,
-    SIID_AIR_PURIFIER,
-    SIID_FAVORITE,
 )
+from .entity import XiaomiPetAirPurifierEntity, derived_state
 
 _LOGGER = logging.getLogger(__name__)
 
 SPEED_RANGE = (FAN_SPEED_MIN, FAN_SPEED_MAX)
 
+PRESET_TO_MODE = {"Auto": MODE_AUTO, "Sleep": MODE_SLEEP, "Favorite": MODE_FAVORITE}
+MODE_TO_PRESET = {mode: preset for preset, mode in PRESET_TO_MODE.items()}
+
+FAN = FanEntityDescription(key="fan", translation_key="fan")
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -42,30 +46,27 @@ async def async_setup_entry(
     """Set up the fan platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities([XiaomiPetAirPurifierFan(coordinator)], True)
+    async_add_entities([XiaomiPetAirPurifierFan(coordinator, FAN)], True)
 
 
-class XiaomiPetAirPurifierFan(CoordinatorEntity, FanEntity):
+class XiaomiPetAirPurifierFan(XiaomiPetAirPurifierEntity, FanEntity):
     """Representation of Xiaomi Pet Air Purifier as a fan."""
 
-    _attr_has_entity_name = True
-    _attr_translation_key = "fan"
     _attr_supported_features = (
         FanEntityFeature.PRESET_MODE | FanEntityFeature.SET_SPEED
     )
     _attr_preset_modes = PRESET_MODES
     _attr_speed_count = int_states_in_range(SPEED_RANGE)
-
-    def __init__(self, coordinator) -> None:
-        """Initialize the fan."""
-        super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.entry.entry_id}_fan"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, coordinator.entry.entry_id)},
-            "name": coordinator.entry.data.get(CONF_NAME, "Pet Air Purifier"),
-            "manufacturer": "Xiaomi",
-            "model": "Smart Pet Care Air Purifier (CPA5)",
-        }
+    _poll_keys = (
+        "power",
+        "mode",
+        "fan_level",
+        "pm25",
+        "filter_life",
+        "filter_used_time",
+        "filter_left_time",
+    )
+    _queue_offline_commands = True
 
     @property
     def is_on(self) -> bool:
@@ -73,13 +74,13 @@ class XiaomiPetAirPurifierFan(CoordinatorEntity, FanEntity):
         return self.coordinator.data.get("power", False)
 
     @property
+    @derived_state
     def preset_mode(self) -> str | None:
         """Return the current preset mode."""
-        mode = self.coordinator.data.get("mode")
-        mode_map = {MODE_AUTO: "Auto", MODE_SLEEP: "Sleep", MODE_FAVORITE: "Favorite"}
-        return mode_map.get(mode)
+        return MODE_TO_PRESET.get(self.coordinator.data.get("mode"))
 
     @property
+    @derived_state
     def percentage(self) -> int | None:
         """Return the current speed percentage."""
         if self.preset_mode != "Favorite":
@@ -92,6 +93,7 @@ class XiaomiPetAirPurifierFan(CoordinatorEntity, FanEntity):
         return ranged_value_to_percentage(SPEED_RANGE, fan_level)
 
     @property
+    @derived_state
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional state attributes."""
         return {
@@ -110,26 +112,25 @@ class XiaomiPetAirPurifierFan(CoordinatorEntity, FanEntity):
         **kwargs: Any,
     ) -> None:
         """Turn on the fan."""
-        try:
-            await self.hass.async_add_executor_job(
-                self.coordinator.device.send,
-                "set_properties",
-                [
-                    {
-                        "did": "power",
-                        "siid": SIID_AIR_PURIFIER,
-                        "piid": PIID_POWER,
-                        "value": True,
-                    }
-                ],
+        values: dict[str, Any] = {"power": True}
+
+        if preset_mode:
+            mode_value = PRESET_TO_MODE.get(preset_mode)
+            if mode_value is None:
+                _LOGGER.error("Invalid preset mode: %s", preset_mode)
+                return
+            values["mode"] = mode_value
+        elif percentage is not None:
+            if percentage == 0:
+                await self.async_turn_off()
+                return
+            values["mode"] = MODE_FAVORITE
+            values["fan_level"] = math.ceil(
+                percentage_to_ranged_value(SPEED_RANGE, percentage)
             )
 
-            if preset_mode:
-                await self.async_set_preset_mode(preset_mode)
-            elif percentage is not None:
-                await self.async_set_percentage(percentage)
-
-            await self.coordinator.async_request_refresh()
+        try:
+            await self.coordinator.async_set_properties(values)
 
         except Exception as ex:
             _LOGGER.error("Failed to turn on: %s", ex)
@@ -137,46 +138,21 @@ class XiaomiPetAirPurifierFan(CoordinatorEntity, FanEntity):
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the fan."""
         try:
-            await self.hass.async_add_executor_job(
-                self.coordinator.device.send,
-                "set_properties",
-                [
-                    {
-                        "did": "power",
-                        "siid": SIID_AIR_PURIFIER,
-                        "piid": PIID_POWER,
-                        "value": False,
-                    }
-                ],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_set_properties({"power": False})
 
         except Exception as ex:
             _LOGGER.error("Failed to turn off: %s", ex)
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode."""
-        mode_map = {"Auto": MODE_AUTO, "Sleep": MODE_SLEEP, "Favorite": MODE_FAVORITE}
-        mode_value = mode_map.get(preset_mode)
+        mode_value = PRESET_TO_MODE.get(preset_mode)
 
         if mode_value is None:
             _LOGGER.error("Invalid preset mode: %s", preset_mode)
             return
 
         try:
-            await self.hass.async_add_executor_job(
-                self.coordinator.device.send,
-                "set_properties",
-                [
-                    {
-                        "did": "mode",
-                        "siid": SIID_AIR_PURIFIER,
-                        "piid": PIID_MODE,
-                        "value": mode_value,
-                    }
-                ],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_set_properties({"mode": mode_value})
 
         except Exception as ex:
             _LOGGER.error("Failed to set preset mode: %s", ex)
@@ -187,26 +163,13 @@ class XiaomiPetAirPurifierFan(CoordinatorEntity, FanEntity):
             await self.async_turn_off()
             return
 
-        fan_level = percentage_to_ranged_value(SPEED_RANGE, percentage)
+        fan_level = math.ceil(percentage_to_ranged_value(SPEED_RANGE, percentage))
 
         try:
-            # First set to Favorite mode
-            await self.async_set_preset_mode("Favorite")
-
-            # Then set fan level
-            await self.hass.async_add_executor_job(
-                self.coordinator.device.send,
-                "set_properties",
-                [
-                    {
-                        "did": "fan_level",
-                        "siid": SIID_FAVORITE,
-                        "piid": PIID_FAN_LEVEL,
-                        "value": fan_level,
-                    }
-                ],
+            # Favorite mode and fan level in a single request
+            await self.coordinator.async_set_properties(
+                {"mode": MODE_FAVORITE, "fan_level": fan_level}
             )
-            await self.coordinator.async_request_refresh()
 
         except Exception as ex:
             _LOGGER.error("Failed to set fan level: %s", ex)
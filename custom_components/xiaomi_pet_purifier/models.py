@@ -0,0 +1,50 @@
+"""Data models for Xiaomi Pet Air Purifier."""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import PROPERTIES
+
+_MISSING = object()
+
+
+class PurifierData:
+    """Snapshot of the device properties published by the coordinator.
+
+    Slotted so that a snapshot is a handful of pointers instead of a dict.
+    Properties that were not polled are left unset. Every published snapshot
+    gets a new `version`, which entities use to cache derived state.
+    """
+
+    __slots__ = (*PROPERTIES, "version")
+
+    def __init__(self, values: dict[str, Any], version: int = 0) -> None:
+        """Initialize the snapshot."""
+        for key, value in values.items():
+            setattr(self, key, value)
+        self.version = version
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a property, or default when it is not available."""
+        return getattr(self, key, default)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the available properties as a dict."""
+        return {
+            key: value
+            for key in PROPERTIES
+            if (value := getattr(self, key, _MISSING)) is not _MISSING
+        }
+
+    def __eq__(self, other: object) -> bool:
+        """Compare two snapshots property by property."""
+        if not isinstance(other, PurifierData):
+            return NotImplemented
+        return all(
+            getattr(self, key, _MISSING) == getattr(other, key, _MISSING)
+            for key in PROPERTIES
+        )
+
+    def __repr__(self) -> str:
+        """Return the representation."""
+        return f"PurifierData({self.as_dict()!r}, version={self.version})"
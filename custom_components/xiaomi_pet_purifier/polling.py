@@ -0,0 +1,148 @@
+"""Fleet-wide poll scheduling for Xiaomi Pet Air Purifiers."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN, SCAN_INTERVAL
+
+DATA_POLL_SCHEDULER = f"{DOMAIN}_poll_scheduler"
+
+
+def _rank(entry_id: str) -> int:
+    """Return a position for an entry that is the same on every restart."""
+    return int.from_bytes(hashlib.sha256(entry_id.encode()).digest()[:8], "big")
+
+
+class FleetPollScheduler:
+    """Spread the polls of all purifiers evenly over the poll interval.
+
+    Purifiers are ordered by a hash of their entry id and given equally
+    spaced phases on the wall clock, so the same fleet is polled at the
+    same offsets after a restart and adding or removing a purifier only
+    shifts the others by a fraction of a slot.
+
+    Polls are not queued behind each other: an unreachable purifier only
+    delays its own next poll, never the rest of the fleet or the refresh
+    that confirms a command.
+    """
+
+    def __init__(self, hass: HomeAssistant, interval: float = SCAN_INTERVAL) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self.interval = interval
+        self._coordinators: dict[str, Any] = {}
+        self._phases: dict[str, float] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._running: set[str] = set()
+        self._rephase_scheduled = False
+
+        self.max_active = 0
+        self.skipped = 0
+
+    @property
+    def active(self) -> int:
+        """Return the number of scheduled polls waiting for their device."""
+        return len(self._running)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return scheduler statistics."""
+        return {
+            "devices": len(self._coordinators),
+            "interval": self.interval,
+            "active_polls": self.active,
+            "max_active_polls": self.max_active,
+            "skipped_polls": self.skipped,
+        }
+
+    def phase(self, entry_id: str) -> float | None:
+        """Return the offset in the interval at which a purifier is polled."""
+        return self._phases.get(entry_id)
+
+    @callback
+    def async_add(self, coordinator) -> CALLBACK_TYPE:
+        """Poll a coordinator until the returned callback is called."""
+        entry_id = coordinator.entry.entry_id
+        self._coordinators[entry_id] = coordinator
+        self._async_schedule_rephase()
+
+        @callback
+        def _remove() -> None:
+            self._coordinators.pop(entry_id, None)
+            self._phases.pop(entry_id, None)
+            if (timer := self._timers.pop(entry_id, None)) is not None:
+                timer.cancel()
+            self._async_schedule_rephase()
+
+        return _remove
+
+    @callback
+    def async_set_interval(self, interval: float) -> None:
+        """Change the poll interval of the fleet."""
+        self.interval = interval
+        self._async_schedule_rephase()
+
+    @callback
+    def _async_schedule_rephase(self) -> None:
+        """Recompute the phases once all pending changes are in."""
+        if not self._rephase_scheduled:
+            self._rephase_scheduled = True
+            self._hass.loop.call_soon(self._async_rephase)
+
+    @callback
+    def _async_rephase(self) -> None:
+        """Give every purifier an equally spaced phase."""
+        self._rephase_scheduled = False
+        order = sorted(self._coordinators, key=_rank)
+        spacing = self.interval / len(order) if order else 0.0
+        self._phases = {
+            entry_id: index * spacing for index, entry_id in enumerate(order)
+        }
+        for entry_id in order:
+            self._async_schedule(entry_id)
+
+    @callback
+    def _async_schedule(self, entry_id: str, polled: bool = False) -> None:
+        """Schedule the next poll of a purifier at its phase."""
+        if (timer := self._timers.pop(entry_id, None)) is not None:
+            timer.cancel()
+        delay = (self._phases[entry_id] - time.time()) % self.interval
+        # A timer firing a little early must not poll twice in one interval
+        if polled and delay < self.interval / 2:
+            delay += self.interval
+        self._timers[entry_id] = self._hass.loop.call_later(
+            delay, self._async_poll, entry_id
+        )
+
+    @callback
+    def _async_poll(self, entry_id: str) -> None:
+        """Refresh a purifier and schedule its next poll."""
+        self._timers.pop(entry_id, None)
+        if (coordinator := self._coordinators.get(entry_id)) is None:
+            return
+        self._async_schedule(entry_id, polled=True)
+
+        if self._hass.is_stopping or coordinator.entry.pref_disable_polling:
+            return
+        if entry_id in self._running:
+            # The last poll is still waiting for the device
+            self.skipped += 1
+            return
+
+        self._running.add(entry_id)
+        self.max_active = max(self.max_active, self.active)
+        task = self._hass.async_create_task(coordinator.async_refresh())
+        task.add_done_callback(lambda _: self._running.discard(entry_id))
+
+
+@callback
+def async_get_poll_scheduler(hass: HomeAssistant) -> FleetPollScheduler:
+    """Return the poll scheduler shared by all purifiers."""
+    if (scheduler := hass.data.get(DATA_POLL_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_POLL_SCHEDULER] = FleetPollScheduler(hass)
+    return scheduler
@@ -0,0 +1,175 @@
+"""Per-device request scheduler for Xiaomi Pet Air Purifier."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from miio import DeviceException
+
+from homeassistant.core import HomeAssistant, callback
+
+# Lower values are sent first
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+
+
+class SchedulerShutdown(DeviceException):
+    """The request was not answered because the purifier was unloaded."""
+
+
+class _Request:
+    """A request waiting for its turn on the device."""
+
+    __slots__ = (
+        "priority",
+        "sequence",
+        "method",
+        "params",
+        "future",
+        "queued",
+        "key",
+    )
+
+    def __init__(
+        self,
+        priority: int,
+        sequence: int,
+        method: str,
+        params: Any,
+        future: asyncio.Future,
+        key: str | None,
+    ) -> None:
+        """Initialize the request."""
+        self.priority = priority
+        self.sequence = sequence
+        self.method = method
+        self.params = params
+        self.future = future
+        self.queued = time.monotonic()
+        self.key = key
+
+    def __lt__(self, other: _Request) -> bool:
+        """Order by priority, then first come first served."""
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class DeviceRequestScheduler:
+    """Send the requests for one device one at a time.
+
+    `miio.Device` is not safe to use from several executor threads at once,
+    so every request is queued and handed to the executor by a single worker.
+    User commands are sent before background polls and identical reads that
+    are already queued or in flight share one request.
+    """
+
+    def __init__(self, hass: HomeAssistant, send: Callable[[str, Any], Any]) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._send = send
+        self._queue: list[_Request] = []
+        self._reads: dict[str, asyncio.Future] = {}
+        self._sequence = itertools.count()
+        self._worker: asyncio.Task | None = None
+        self._current: _Request | None = None
+        self._closed = False
+
+        self.requests = 0
+        self.merged_reads = 0
+        self.max_queue_depth = 0
+        self.last_wait: dict[int, float] = {}
+        self.max_wait: dict[int, float] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of requests waiting to be sent."""
+        return len(self._queue)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return scheduler statistics."""
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "merged_reads": self.merged_reads,
+            "last_wait_command": self.last_wait.get(PRIORITY_COMMAND),
+            "last_wait_poll": self.last_wait.get(PRIORITY_POLL),
+            "max_wait_command": self.max_wait.get(PRIORITY_COMMAND),
+            "max_wait_poll": self.max_wait.get(PRIORITY_POLL),
+        }
+
+    async def async_request(
+        self, method: str, params: Any, priority: int = PRIORITY_COMMAND
+    ) -> Any:
+        """Queue a request and return the device response."""
+        if self._closed:
+            raise SchedulerShutdown("Purifier is unloaded")
+
+        key = None
+        if method == "get_properties":
+            key = json.dumps(params, sort_keys=True)
+            if (future := self._reads.get(key)) is not None:
+                self.merged_reads += 1
+                return await asyncio.shield(future)
+
+        future = self._hass.loop.create_future()
+        if key is not None:
+            self._reads[key] = future
+        heapq.heappush(
+            self._queue,
+            _Request(priority, next(self._sequence), method, params, future, key),
+        )
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+
+        if self._worker is None:
+            self._worker = self._hass.async_create_task(self._async_run())
+
+        return await asyncio.shield(future)
+
+    async def _async_run(self) -> None:
+        """Send queued requests until the queue is empty."""
+        try:
+            while self._queue:
+                request = self._current = heapq.heappop(self._queue)
+                wait = time.monotonic() - request.queued
+                self.last_wait[request.priority] = wait
+                self.max_wait[request.priority] = max(
+                    self.max_wait.get(request.priority, 0.0), wait
+                )
+                self.requests += 1
+
+                try:
+                    result = await self._hass.async_add_executor_job(
+                        self._send, request.method, request.params
+                    )
+                except Exception as ex:  # pylint: disable=broad-except
+                    request.future.set_exception(ex)
+                else:
+                    request.future.set_result(result)
+                finally:
+                    if request.key is not None:
+                        self._reads.pop(request.key, None)
+        finally:
+            self._worker = None
+            self._current = None
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the worker and fail queued requests."""
+        self._closed = True
+        if self._worker is not None:
+            self._worker.cancel()
+
+        requests = self._queue
+        if self._current is not None:
+            requests.append(self._current)
+        for request in requests:
+            if not request.future.done():
+                request.future.set_exception(SchedulerShutdown("Purifier is unloaded"))
+        self._queue = []
+        self._reads.clear()
@@ -1,14 +1,13 @@
 """Select platform for Xiaomi Pet Air Purifier."""
 import logging
 
-from homeassistant.components.select import SelectEntity
+from homeassistant.components.select import SelectEntity, SelectEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, MODE_AUTO, MODE_FAVORITE, MODE_SLEEP, PIID_MODE, SIID_AIR_PURIFIER
+from .const import DOMAIN, MODE_AUTO, MODE_FAVORITE, MODE_SLEEP
+from .entity import XiaomiPetAirPurifierEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,6 +18,12 @@ MODE_TO_VALUE = {
 }
 VALUE_TO_MODE = {v: k for k, v in MODE_TO_VALUE.items()}
 
+MODE_SELECT = SelectEntityDescription(
+    key="mode",
+    translation_key="mode",
+    icon="mdi:air-purifier",
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -27,32 +32,18 @@ async def async_setup_entry(
 ) -> None:
     """Set up the select platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    name = entry.data.get(CONF_NAME, "Pet Air Purifier")
 
     async_add_entities(
-        [XiaomiPetAirPurifierModeSelect(coordinator, name)],
+        [XiaomiPetAirPurifierModeSelect(coordinator, MODE_SELECT)],
         True,
     )
 
 
-class XiaomiPetAirPurifierModeSelect(CoordinatorEntity, SelectEntity):
+class XiaomiPetAirPurifierModeSelect(XiaomiPetAirPurifierEntity, SelectEntity):
     """Representation of a Xiaomi Pet Air Purifier mode select."""
 
-    _attr_has_entity_name = True
-    _attr_translation_key = "mode"
-
-    def __init__(self, coordinator, device_name: str) -> None:
-        """Initialize the select entity."""
-        super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.entry.entry_id}_mode"
-        self._attr_options = list(MODE_TO_VALUE.keys())
-        self._attr_icon = "mdi:air-purifier"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, coordinator.entry.entry_id)},
-            "name": device_name,
-            "manufacturer": "Xiaomi",
-            "model": "Smart Pet Care Air Purifier (CPA5)",
-        }
+    _attr_options = list(MODE_TO_VALUE)
+    _queue_offline_commands = True
 
     @property
     def current_option(self) -> str | None:
@@ -67,23 +58,7 @@ class XiaomiPetAirPurifierModeSelect(CoordinatorEntity, SelectEntity):
             return
 
         try:
-            # Optimistic update
-            self.coordinator.data["mode"] = value
-            self.async_write_ha_state()
-
-            await self.hass.async_add_executor_job(
-                self.coordinator.device.send,
-                "set_properties",
-                [
-                    {
-                        "did": "mode",
-                        "siid": SIID_AIR_PURIFIER,
-                        "piid": PIID_MODE,
-                        "value": value,
-                    }
-                ],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_set_properties({"mode": value})
 
         except Exception as ex:
             _LOGGER.error("Failed to set mode to %s: %s", option, ex)
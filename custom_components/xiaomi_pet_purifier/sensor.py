@@ -4,18 +4,83 @@ import logging
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME, PERCENTAGE, UnitOfTime
+from homeassistant.const import PERCENTAGE, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .aggregate import AreaAggregate
+from .const import CONF_ENTRY_TYPE, DOMAIN, ENTRY_TYPE_GROUP
+from .entity import XiaomiPetAirPurifierEntity, derived_state
 
 _LOGGER = logging.getLogger(__name__)
 
+SENSORS = (
+    SensorEntityDescription(
+        key="pm25",
+        translation_key="pm25",
+        icon="mdi:air-filter",
+        native_unit_of_measurement="µg/m³",
+        device_class=SensorDeviceClass.PM25,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="filter_life",
+        translation_key="filter_life",
+        icon="mdi:air-filter",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    # Filter time sensors are disabled by default
+    SensorEntityDescription(
+        key="filter_used_time",
+        translation_key="filter_used_time",
+        icon="mdi:clock-outline",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="filter_left_time",
+        translation_key="filter_left_time",
+        icon="mdi:clock-outline",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+)
+
+# Reported by the device in hours, shown in days
+HOURS_SENSORS = frozenset({"filter_used_time", "filter_left_time"})
+
+AGGREGATE_SENSORS = (
+    SensorEntityDescription(
+        key="pm25_mean",
+        translation_key="pm25_mean",
+        icon="mdi:air-filter",
+        native_unit_of_measurement="µg/m³",
+        device_class=SensorDeviceClass.PM25,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="pm25_max",
+        translation_key="pm25_max",
+        icon="mdi:air-filter",
+        native_unit_of_measurement="µg/m³",
+        device_class=SensorDeviceClass.PM25,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="worst_device",
+        translation_key="worst_device",
+        icon="mdi:alert-circle-outline",
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -23,94 +88,44 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_GROUP:
+        aggregate = hass.data[DOMAIN][entry.entry_id]
+        device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": entry.title,
+            "manufacturer": "Xiaomi",
+            "model": "Purifier group",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
+        async_add_entities(
+            XiaomiPetAirPurifierAggregateSensor(
+                aggregate, entry, device_info, description
+            )
+            for description in AGGREGATE_SENSORS
+        )
+        return
+
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    name = entry.data.get(CONF_NAME, "Pet Air Purifier")
-
-    sensors = [
-        XiaomiPetAirPurifierSensor(
-            coordinator,
-            name,
-            "pm25",
-            "mdi:air-filter",
-            "µg/m³",
-            SensorDeviceClass.PM25,
-            SensorStateClass.MEASUREMENT,
-        ),
-        XiaomiPetAirPurifierSensor(
-            coordinator,
-            name,
-            "filter_life",
-            "mdi:air-filter",
-            PERCENTAGE,
-            None,
-            SensorStateClass.MEASUREMENT,
-        ),
-        XiaomiPetAirPurifierSensor(
-            coordinator,
-            name,
-            "filter_used_time",
-            "mdi:clock-outline",
-            UnitOfTime.DAYS,
-            None,
-            SensorStateClass.TOTAL_INCREASING,
-        ),
-        XiaomiPetAirPurifierSensor(
-            coordinator,
-            name,
-            "filter_left_time",
-            "mdi:clock-outline",
-            UnitOfTime.DAYS,
-            None,
-            SensorStateClass.MEASUREMENT,
-        ),
-    ]
-
-    async_add_entities(sensors, True)
-
-
-class XiaomiPetAirPurifierSensor(CoordinatorEntity, SensorEntity):
-    """Representation of a Xiaomi Pet Air Purifier sensor."""
 
-    _attr_has_entity_name = True
+    async_add_entities(
+        [
+            XiaomiPetAirPurifierSensor(coordinator, description)
+            for description in SENSORS
+        ],
+        True,
+    )
 
-    def __init__(
-        self,
-        coordinator,
-        device_name: str,
-        sensor_type: str,
-        icon: str,
-        unit: str | None,
-        device_class: SensorDeviceClass | None,
-        state_class: SensorStateClass | None,
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._sensor_type = sensor_type
-        self._attr_unique_id = f"{coordinator.entry.entry_id}_{sensor_type}"
-        self._attr_icon = icon
-        self._attr_native_unit_of_measurement = unit
-        self._attr_device_class = device_class
-        self._attr_state_class = state_class
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, coordinator.entry.entry_id)},
-            "name": device_name,
-            "manufacturer": "Xiaomi",
-            "model": "Smart Pet Care Air Purifier (CPA5)",
-        }
-        self._attr_translation_key = sensor_type
 
-        # Disable filter time sensors by default
-        if sensor_type in ["filter_used_time", "filter_left_time"]:
-            self._attr_entity_registry_enabled_default = False
+class XiaomiPetAirPurifierSensor(XiaomiPetAirPurifierEntity, SensorEntity):
+    """Representation of a Xiaomi Pet Air Purifier sensor."""
 
     @property
+    @derived_state
     def native_value(self):
         """Return the state of the sensor."""
-        value = self.coordinator.data.get(self._sensor_type)
-        if value is not None and self._sensor_type in [
-            "filter_used_time",
-            "filter_left_time",
-        ]:
+        key = self.entity_description.key
+        value = self.coordinator.data.get(key)
+        if value is not None and key in HOURS_SENSORS:
             return round(value / 24, 1)
         return value
 
@@ -118,3 +133,47 @@ class XiaomiPetAirPurifierSensor(CoordinatorEntity, SensorEntity):
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self.async_write_ha_state()
+
+
+class XiaomiPetAirPurifierAggregateSensor(SensorEntity):
+    """PM2.5 aggregate over a group of Xiaomi Pet Air Purifiers."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        aggregate: AreaAggregate,
+        entry: ConfigEntry,
+        device_info: dict,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the aggregate sensor."""
+        self.entity_description = description
+        self._aggregate = aggregate
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = device_info
+        self._attr_native_value = self._aggregate_value()
+
+    def _aggregate_value(self):
+        """Return the current value of this aggregate."""
+        key = self.entity_description.key
+        if key == "pm25_mean":
+            return self._aggregate.mean
+        if key == "pm25_max":
+            return self._aggregate.max
+        return self._aggregate.worst_device
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to aggregate changes."""
+        self.async_on_remove(
+            self._aggregate.async_add_listener(self._handle_aggregate_update)
+        )
+
+    @callback
+    def _handle_aggregate_update(self) -> None:
+        """Write state only when this aggregate changed."""
+        value = self._aggregate_value()
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
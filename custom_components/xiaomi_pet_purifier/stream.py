@@ -0,0 +1,191 @@
+"""High-rate PM2.5 websocket stream for Xiaomi Pet Air Purifier.
+
+Samples are pushed straight to subscribed frontends and never go through the
+state machine, so they cost no state writes, events or recorder rows.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+import voluptuous as vol
+from miio import DeviceException
+
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN, STREAM_FRAME_INTERVAL, STREAM_POLL_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_WEBSOCKET_REGISTERED = f"{DOMAIN}_websocket_registered"
+
+
+class Pm25Stream:
+    """Poll PM2.5 at a high rate while anyone is subscribed."""
+
+    def __init__(self, coordinator) -> None:
+        """Initialize the stream."""
+        self._coordinator = coordinator
+        self._subscribers: dict[
+            Callable[[float, float], None], CALLBACK_TYPE | None
+        ] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def subscribers(self) -> int:
+        """Return the number of subscribers."""
+        return len(self._subscribers)
+
+    @callback
+    def async_subscribe(
+        self,
+        sample_callback: Callable[[float, float], None],
+        end_callback: CALLBACK_TYPE | None = None,
+    ) -> CALLBACK_TYPE:
+        """Receive (timestamp, pm25) samples until the returned callback is called.
+
+        `end_callback` is called if the stream shuts down first, when the
+        purifier is unloaded or reloaded.
+        """
+        self._subscribers[sample_callback] = end_callback
+        if self._task is None:
+            self._task = self._coordinator.hass.async_create_task(self._async_run())
+
+        @callback
+        def _unsubscribe() -> None:
+            self._subscribers.pop(sample_callback, None)
+            if not self._subscribers and self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+        return _unsubscribe
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop polling and end all subscriptions."""
+        end_callbacks = list(self._subscribers.values())
+        self._subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for end_callback in end_callbacks:
+            if end_callback is not None:
+                end_callback()
+
+    async def _async_run(self) -> None:
+        """Poll PM2.5 until the last subscriber leaves."""
+        coordinator = self._coordinator
+        loop = coordinator.hass.loop
+        while True:
+            started = loop.time()
+            try:
+                data = await coordinator.async_get_properties(["pm25"])
+            except DeviceException as ex:
+                _LOGGER.debug("High-rate PM2.5 poll failed: %s", ex)
+            else:
+                if (value := data.get("pm25")) is not None:
+                    timestamp = time.time()
+                    coordinator.async_add_pm25_sample(value)
+                    for sample_callback in list(self._subscribers):
+                        sample_callback(timestamp, value)
+
+            await asyncio.sleep(
+                max(0.0, STREAM_POLL_INTERVAL - (loop.time() - started))
+            )
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the websocket commands once."""
+    if hass.data.get(DATA_WEBSOCKET_REGISTERED):
+        return
+    hass.data[DATA_WEBSOCKET_REGISTERED] = True
+    websocket_api.async_register_command(hass, websocket_subscribe_pm25)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/pm25/subscribe",
+        vol.Optional("entry_ids"): [str],
+    }
+)
+@callback
+def websocket_subscribe_pm25(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream raw PM2.5 samples of the given purifiers, batched per frame."""
+    streams = {
+        entry_id: stream
+        for entry_id, coordinator in hass.data.get(DOMAIN, {}).items()
+        if (stream := getattr(coordinator, "pm25_stream", None)) is not None
+    }
+    if entry_ids := msg.get("entry_ids"):
+        if missing := [entry_id for entry_id in entry_ids if entry_id not in streams]:
+            connection.send_error(
+                msg["id"],
+                websocket_api.ERR_NOT_FOUND,
+                f"Purifiers not loaded: {', '.join(missing)}",
+            )
+            return
+        streams = {entry_id: streams[entry_id] for entry_id in entry_ids}
+
+    samples: list[dict[str, Any]] = []
+    flush_handle: asyncio.TimerHandle | None = None
+
+    @callback
+    def _flush() -> None:
+        nonlocal flush_handle
+        flush_handle = None
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"samples": samples.copy()})
+        )
+        samples.clear()
+
+    def _sample_callback(entry_id: str) -> Callable[[float, float], None]:
+        @callback
+        def _add_sample(timestamp: float, value: float) -> None:
+            nonlocal flush_handle
+            samples.append({"entry_id": entry_id, "time": timestamp, "pm25": value})
+            if flush_handle is None:
+                flush_handle = hass.loop.call_later(STREAM_FRAME_INTERVAL, _flush)
+
+        return _add_sample
+
+    @callback
+    def _unsubscribe() -> None:
+        for unsubscribe in unsubscribes:
+            unsubscribe()
+        if flush_handle is not None:
+            flush_handle.cancel()
+
+    def _end_callback(entry_id: str) -> CALLBACK_TYPE:
+        @callback
+        def _end() -> None:
+            # The purifier was unloaded, its new stream needs a new subscription
+            if connection.subscriptions.pop(msg["id"], None) is None:
+                return
+            if flush_handle is not None:
+                flush_handle.cancel()
+                _flush()
+            _unsubscribe()
+            connection.send_message(
+                websocket_api.error_message(
+                    msg["id"], "purifier_unloaded", f"Purifier {entry_id} unloaded"
+                )
+            )
+
+        return _end
+
+    unsubscribes = [
+        stream.async_subscribe(_sample_callback(entry_id), _end_callback(entry_id))
+        for entry_id, stream in streams.items()
+    ]
+
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
@@ -1,23 +1,29 @@
 """Switch platform for Xiaomi Pet Air Purifier."""
 import logging
 
-from homeassistant.components.switch import SwitchEntity
+from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-
-from .const import (
-    DOMAIN,
-    PIID_ALARM,
-    PIID_CHILD_LOCK,
-    SIID_ALARM,
-    SIID_PHYSICAL_CONTROLS,
-)
+
+from .const import DOMAIN
+from .entity import XiaomiPetAirPurifierEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+SWITCHES = (
+    SwitchEntityDescription(
+        key="child_lock",
+        translation_key="child_lock",
+        icon="mdi:lock",
+    ),
+    SwitchEntityDescription(
+        key="alarm",
+        translation_key="alarm",
+        icon="mdi:volume-high",
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -26,117 +32,43 @@ async def async_setup_entry(
 ) -> None:
     """Set up the switch platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    name = entry.data.get(CONF_NAME, "Pet Air Purifier")
-
-    switches = [
-        XiaomiPetAirPurifierSwitch(
-            coordinator,
-            name,
-            "child_lock",
-            "mdi:lock",
-            SIID_PHYSICAL_CONTROLS,
-            PIID_CHILD_LOCK,
-        ),
-        XiaomiPetAirPurifierSwitch(
-            coordinator,
-            name,
-            "alarm",
-            "mdi:volume-high",
-            SIID_ALARM,
-            PIID_ALARM,
-        ),
-    ]
-
-    async_add_entities(switches, True)
-
-
-class XiaomiPetAirPurifierSwitch(CoordinatorEntity, SwitchEntity):
+
+    async_add_entities(
+        [
+            XiaomiPetAirPurifierSwitch(coordinator, description)
+            for description in SWITCHES
+        ],
+        True,
+    )
+
+
+class XiaomiPetAirPurifierSwitch(XiaomiPetAirPurifierEntity, SwitchEntity):
     """Representation of a Xiaomi Pet Air Purifier switch."""
 
-    _attr_has_entity_name = True
-
-    def __init__(
-        self,
-        coordinator,
-        device_name: str,
-        switch_type: str,
-        icon: str,
-        siid: int,
-        piid: int,
-    ) -> None:
-        """Initialize the switch."""
-        super().__init__(coordinator)
-        self._switch_type = switch_type
-        self._siid = siid
-        self._piid = piid
-        self._attr_unique_id = f"{coordinator.entry.entry_id}_{switch_type}"
-        self._attr_icon = icon
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, coordinator.entry.entry_id)},
-            "name": device_name,
-            "manufacturer": "Xiaomi",
-            "model": "Smart Pet Care Air Purifier (CPA5)",
-        }
-        self._attr_translation_key = switch_type
+    _queue_offline_commands = True
 
     @property
     def is_on(self) -> bool:
         """Return true if switch is on."""
-        return self.coordinator.data.get(self._switch_type, False)
+        return self.coordinator.data.get(self.entity_description.key, False)
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the switch on."""
+        key = self.entity_description.key
         try:
-            # Optimistic update
-            self.coordinator.data[self._switch_type] = True
-            self.async_write_ha_state()
-
-            await self.hass.async_add_executor_job(
-                self.coordinator.device.send,
-                "set_properties",
-                [
-                    {
-                        "did": self._switch_type,
-                        "siid": self._siid,
-                        "piid": self._piid,
-                        "value": True,
-                    }
-                ],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_set_properties({key: True})
 
         except Exception as ex:
-            # Revert on failure
-            self.coordinator.data[self._switch_type] = False
-            self.async_write_ha_state()
-            _LOGGER.error("Failed to turn on %s: %s", self._switch_type, ex)
+            _LOGGER.error("Failed to turn on %s: %s", key, ex)
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the switch off."""
+        key = self.entity_description.key
         try:
-            # Optimistic update
-            self.coordinator.data[self._switch_type] = False
-            self.async_write_ha_state()
-
-            await self.hass.async_add_executor_job(
-                self.coordinator.device.send,
-                "set_properties",
-                [
-                    {
-                        "did": self._switch_type,
-                        "siid": self._siid,
-                        "piid": self._piid,
-                        "value": False,
-                    }
-                ],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_set_properties({key: False})
 
         except Exception as ex:
-            # Revert on failure
-            self.coordinator.data[self._switch_type] = True
-            self.async_write_ha_state()
-            _LOGGER.error("Failed to turn off %s: %s", self._switch_type, ex)
+            _LOGGER.error("Failed to turn off %s: %s", key, ex)
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -0,0 +1,228 @@
+"""Device I/O trace recording and replay for Xiaomi Pet Air Purifier."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from miio import DeviceException
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_MAGIC = b"XPPT\x01"
+
+# timestamp, duration, method, flags, params length, result length
+_RECORD = struct.Struct("<dfBBII")
+
+METHODS = ("get_properties", "set_properties")
+
+FLAG_ERROR = 0x01
+
+
+class TraceRecord:
+    """A single request/response pair read from a trace file."""
+
+    __slots__ = ("timestamp", "duration", "method", "params", "result", "error")
+
+    def __init__(
+        self,
+        timestamp: float,
+        duration: float,
+        method: str,
+        params: Any,
+        result: Any,
+        error: bool,
+    ) -> None:
+        """Initialize the record."""
+        self.timestamp = timestamp
+        self.duration = duration
+        self.method = method
+        self.params = params
+        self.result = result
+        self.error = error
+
+
+def _encode(value: Any) -> bytes:
+    """Encode a payload as compact JSON."""
+    return json.dumps(value, separators=(",", ":"), default=str).encode()
+
+
+class TraceRecorder:
+    """Append-only binary recorder of device requests and responses.
+
+    Records are written from executor threads, so all file access is
+    serialized with a lock and done synchronously.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the recorder."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def open(self) -> None:
+        """Open the trace file for appending (runs in executor)."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock:
+            self._file = open(self.path, "ab")  # pylint: disable=consider-using-with
+            if self._file.tell() == 0:
+                self._file.write(TRACE_MAGIC)
+                self._file.flush()
+
+    def close(self) -> None:
+        """Close the trace file (runs in executor)."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def record(
+        self,
+        timestamp: float,
+        duration: float,
+        method: str,
+        params: Any,
+        result: Any,
+        error: bool = False,
+    ) -> None:
+        """Append one request/response pair to the trace."""
+        if method not in METHODS:
+            return
+
+        params_raw = _encode(params)
+        result_raw = _encode(result)
+        header = _RECORD.pack(
+            timestamp,
+            duration,
+            METHODS.index(method),
+            FLAG_ERROR if error else 0,
+            len(params_raw),
+            len(result_raw),
+        )
+
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                self._file.write(header + params_raw + result_raw)
+                self._file.flush()
+            except OSError as ex:
+                _LOGGER.error("Failed to write trace %s: %s", self.path, ex)
+
+
+def read_trace(path: str) -> Iterator[TraceRecord]:
+    """Iterate over the records of a trace file."""
+    with open(path, "rb") as file:
+        if file.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f"{path} is not a device trace")
+
+        while header := file.read(_RECORD.size):
+            if len(header) < _RECORD.size:
+                _LOGGER.warning("Truncated record at end of %s", path)
+                return
+
+            timestamp, duration, method, flags, params_len, result_len = (
+                _RECORD.unpack(header)
+            )
+            payload = file.read(params_len + result_len)
+            if len(payload) < params_len + result_len:
+                _LOGGER.warning("Truncated record at end of %s", path)
+                return
+
+            yield TraceRecord(
+                timestamp,
+                duration,
+                METHODS[method],
+                json.loads(payload[:params_len]),
+                json.loads(payload[params_len:]),
+                bool(flags & FLAG_ERROR),
+            )
+
+
+class TraceReplayDevice:
+    """Stand-in for `miio.Device` that answers from a trace record."""
+
+    def __init__(self, record: TraceRecord | None = None) -> None:
+        """Initialize the replay device."""
+        self.record = record
+
+    def send(self, command: str, parameters: Any = None) -> Any:
+        """Return the recorded response of the current record."""
+        record = self.record
+        if record is None or record.method != command:
+            raise DeviceException(f"No recorded response for {command}")
+        if record.error:
+            raise DeviceException(record.result)
+        return record.result
+
+
+async def async_replay_trace(
+    coordinator, path: str, speed: float | None = None
+) -> dict[str, Any]:
+    """Feed a recorded trace through a coordinator and its entities.
+
+    The coordinator must have been created on a `TraceReplayDevice`, in a
+    Home Assistant instance of its own: replayed values are published to
+    its state machine. Polls are replayed as coordinator refreshes and
+    commands as device sends, in recorded order. With no `speed` the trace
+    runs as fast as possible, otherwise recorded gaps are divided by `speed`.
+    """
+    device = coordinator.device
+    if not isinstance(device, TraceReplayDevice):
+        raise ValueError("Trace replay needs a coordinator on a TraceReplayDevice")
+
+    hass = coordinator.hass
+    records = await hass.async_add_executor_job(lambda: list(read_trace(path)))
+
+    state_writes = 0
+
+    @callback
+    def _count_state_write(event: Event) -> None:
+        nonlocal state_writes
+        state_writes += 1
+
+    remove_listener = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_state_write)
+
+    wall_start = time.monotonic()
+    cpu_start = time.process_time()
+    try:
+        for record in records:
+            if speed and records[0] is not record:
+                delay = (record.timestamp - records[0].timestamp) / speed
+                delay -= time.monotonic() - wall_start
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            device.record = record
+            if record.method == "get_properties":
+                await coordinator.async_refresh()
+            else:
+                try:
+                    await coordinator.scheduler.async_request(
+                        record.method, record.params
+                    )
+                except DeviceException:
+                    pass
+        await hass.async_block_till_done()
+    finally:
+        remove_listener()
+
+    return {
+        "records": len(records),
+        "polls": sum(record.method == "get_properties" for record in records),
+        "recorded_seconds": (
+            records[-1].timestamp - records[0].timestamp if records else 0.0
+        ),
+        "wall_seconds": time.monotonic() - wall_start,
+        "cpu_seconds": time.process_time() - cpu_start,
+        "state_writes": state_writes,
+    }
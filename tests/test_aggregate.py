@@ -0,0 +1,139 @@
+"""Tests for the purifier group PM2.5 aggregates."""
+import pytest
+
+from custom_components.xiaomi_pet_purifier import aggregate as aggregate_module
+from custom_components.xiaomi_pet_purifier.aggregate import AreaAggregate
+from custom_components.xiaomi_pet_purifier.const import AGGREGATE_VECTORIZE_THRESHOLD
+
+
+class _Coordinator:
+    """Member coordinator with a fixed PM2.5 sample."""
+
+    def __init__(self, pm25):
+        """Initialize the coordinator."""
+        self.last_update_success = True
+        self.data = {"pm25": pm25}
+        self.listeners = []
+
+    def async_add_consumer(self, *keys):
+        """Subscribe to properties."""
+        return lambda: None
+
+    def async_add_listener(self, update_callback):
+        """Listen for updates."""
+        self.listeners.append(update_callback)
+        return lambda: self.listeners.remove(update_callback)
+
+
+def _aggregate(size):
+    """Return an aggregate over `size` members."""
+    return AreaAggregate(
+        [f"entry_{index}" for index in range(size)],
+        [f"Purifier {index}" for index in range(size)],
+    )
+
+
+@pytest.fixture(params=[False, True], ids=["python", "numpy"])
+def aggregate(request):
+    """Return a group small enough for the Python path or large enough for numpy."""
+    if request.param:
+        pytest.importorskip("numpy")
+        result = _aggregate(AGGREGATE_VECTORIZE_THRESHOLD)
+        assert result._array is not None
+    else:
+        result = _aggregate(4)
+        assert result._array is None
+    return result
+
+
+def test_empty_group(aggregate):
+    """Without samples there is no mean, maximum or worst device."""
+    assert aggregate.mean is None
+    assert aggregate.max is None
+    assert aggregate.worst_device is None
+
+
+def test_update_tracks_mean_and_max(aggregate):
+    """Each sample updates the running mean and maximum."""
+    assert aggregate._update(0, 10)
+    assert aggregate._update(1, 30)
+    assert aggregate._update(2, 20)
+    assert aggregate.mean == 20
+    assert aggregate.max == 30
+    assert aggregate.worst_device == "Purifier 1"
+
+    assert not aggregate._update(2, 20)
+
+
+def test_worst_device_improving_rescans(aggregate):
+    """When the worst device improves the next worst takes over."""
+    aggregate._update(0, 10)
+    aggregate._update(1, 30)
+    aggregate._update(2, 20)
+
+    aggregate._update(1, 5)
+    assert aggregate.max == 20
+    assert aggregate.worst_device == "Purifier 2"
+    assert aggregate.mean == pytest.approx(11.7)
+
+
+def test_member_without_value_is_left_out(aggregate):
+    """A member that loses its value no longer counts."""
+    aggregate._update(0, 10)
+    aggregate._update(1, 30)
+
+    aggregate._update(1, None)
+    assert aggregate.mean == 10
+    assert aggregate.worst_device == "Purifier 0"
+
+    aggregate._update(0, None)
+    assert aggregate.mean is None
+    assert aggregate.worst_device is None
+
+
+def test_rescan_max_skips_missing_values(aggregate):
+    """A rescan only considers members with a value."""
+    aggregate._update(2, 15)
+    aggregate._update(3, 12)
+    aggregate._max_index = None
+
+    aggregate._rescan_max()
+    assert aggregate._max_index == 2
+
+
+def test_rescan_without_numpy(monkeypatch):
+    """Large groups fall back to a Python scan when numpy is missing."""
+    monkeypatch.setattr(aggregate_module, "np", None)
+    aggregate = _aggregate(AGGREGATE_VECTORIZE_THRESHOLD)
+    assert aggregate._array is None
+
+    aggregate._update(5, 40)
+    aggregate._update(9, 25)
+    aggregate._update(5, 1)
+    assert aggregate.worst_device == "Purifier 9"
+
+
+def test_attach_and_detach_members():
+    """Members join and leave the aggregate without rebuilding it."""
+    aggregate = _aggregate(2)
+    updates = []
+    aggregate.async_add_listener(lambda: updates.append(aggregate.mean))
+    first = _Coordinator(10)
+    second = _Coordinator(30)
+
+    aggregate.async_attach("entry_0", first)
+    aggregate.async_attach("entry_1", second)
+    aggregate.async_attach("other_entry", _Coordinator(100))
+    assert updates == [10, 20]
+
+    second.data = {"pm25": 50}
+    second.listeners[0]()
+    assert aggregate.max == 50
+
+    aggregate.async_detach("entry_1")
+    assert second.listeners == []
+    assert aggregate.mean == 10
+    assert aggregate.worst_device == "Purifier 0"
+
+    aggregate.async_stop()
+    assert first.listeners == []
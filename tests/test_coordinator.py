@@ -0,0 +1,79 @@
+"""Tests for merging optimistic writes into the coordinator data."""
+import time
+
+from custom_components.xiaomi_pet_purifier import (
+    PendingWrite,
+    XiaomiPetAirPurifierCoordinator,
+)
+from custom_components.xiaomi_pet_purifier.models import PurifierData
+
+
+def _coordinator(polled, pending=None):
+    """Return a coordinator with only the state `_merge_pending` uses."""
+    coordinator = XiaomiPetAirPurifierCoordinator.__new__(
+        XiaomiPetAirPurifierCoordinator
+    )
+    coordinator._polled = dict(polled)
+    coordinator._pending = dict(pending or {})
+    coordinator._data_version = 0
+    coordinator.data = None
+    return coordinator
+
+
+def _pending(value, expires_in=60.0, confirmed_version=None):
+    """Return a pending write expiring `expires_in` seconds from now."""
+    pending = PendingWrite(value, time.monotonic() + expires_in)
+    pending.confirmed_version = confirmed_version
+    return pending
+
+
+def test_pending_write_overlays_poll():
+    """A pending write is shown instead of the polled value."""
+    coordinator = _coordinator({"power": False, "pm25": 10}, {"power": _pending(True)})
+    data = coordinator._merge_pending()
+    assert data.get("power") is True
+    assert data.get("pm25") == 10
+    assert "power" in coordinator._pending
+
+
+def test_expired_pending_write_is_dropped():
+    """A pending write past its expiry gives way to the polled value."""
+    coordinator = _coordinator(
+        {"power": False}, {"power": _pending(True, expires_in=-1.0)}
+    )
+    assert coordinator._merge_pending().get("power") is False
+    assert coordinator._pending == {}
+
+
+def test_pending_write_kept_until_later_poll():
+    """Only a poll started after the acknowledgement clears a write."""
+    coordinator = _coordinator(
+        {"power": False}, {"power": _pending(True, confirmed_version=3)}
+    )
+    assert coordinator._merge_pending(poll_version=3).get("power") is True
+    assert "power" in coordinator._pending
+
+    coordinator._polled["power"] = True
+    assert coordinator._merge_pending(poll_version=4).get("power") is True
+    assert coordinator._pending == {}
+
+
+def test_unacknowledged_write_survives_polls():
+    """A write the device has not acknowledged is not cleared by polls."""
+    coordinator = _coordinator({"power": False}, {"power": _pending(True)})
+    assert coordinator._merge_pending(poll_version=10).get("power") is True
+    assert "power" in coordinator._pending
+
+
+def test_version_only_changes_with_data():
+    """The same values keep their snapshot, new values get the next version."""
+    coordinator = _coordinator({"pm25": 10})
+    first = coordinator.data = coordinator._merge_pending()
+    assert first.version == 1
+
+    assert coordinator._merge_pending() is first
+
+    coordinator._polled["pm25"] = 11
+    second = coordinator._merge_pending()
+    assert second == PurifierData({"pm25": 11})
+    assert second.version == 2
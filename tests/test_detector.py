@@ -0,0 +1,77 @@
+"""Tests for the PM2.5 spike detector."""
+from custom_components.xiaomi_pet_purifier.detector import Pm25SpikeDetector
+
+
+def _feed(detector, levels, interval=30.0, start=0.0):
+    """Feed (value, seconds) segments sampled every `interval` seconds."""
+    events = []
+    timestamp = start
+    for value, duration in levels:
+        end = timestamp + duration
+        while timestamp < end:
+            if (event := detector.update(value, timestamp)) is not None:
+                events.append(event)
+            timestamp += interval
+    return events, timestamp
+
+
+def test_first_sample_sets_baseline():
+    """The first sample becomes the baseline."""
+    detector = Pm25SpikeDetector()
+    assert detector.update(12, 0.0) is None
+    assert detector.baseline == 12
+
+
+def test_steady_level_does_not_fire():
+    """A flat background with noise below the drift never fires."""
+    detector = Pm25SpikeDetector()
+    events, _ = _feed(detector, [(10, 3600), (13, 3600), (10, 3600)])
+    assert events == []
+
+
+def test_spike_fires_once_with_onset():
+    """A sharp rise fires a single event dated at the start of the rise."""
+    detector = Pm25SpikeDetector()
+    events, _ = _feed(detector, [(10, 3600), (80, 600), (10, 3600)])
+    assert len(events) == 1
+    event = events[0]
+    assert event.onset == 3600
+    assert event.value == 80
+    assert event.baseline == 10
+    assert event.magnitude == 70
+
+
+def test_fires_again_after_return_to_baseline():
+    """Each separate spike fires its own event."""
+    detector = Pm25SpikeDetector()
+    events, _ = _feed(
+        detector, [(10, 3600), (80, 300), (10, 1800), (80, 300), (10, 600)]
+    )
+    assert [event.onset for event in events] == [3600, 5700]
+
+
+def test_detects_spike_after_sustained_level_shift():
+    """A long step in the background level does not blind the detector."""
+    detector = Pm25SpikeDetector()
+    events, timestamp = _feed(detector, [(10, 3600), (40, 3 * 3600), (10, 6 * 3600)])
+    assert len(events) == 1
+
+    events, _ = _feed(detector, [(80, 300)], start=timestamp)
+    assert len(events) == 1
+    assert events[0].value == 80
+
+
+def test_baseline_follows_sustained_shift():
+    """The baseline re-learns a new background level."""
+    detector = Pm25SpikeDetector()
+    _feed(detector, [(10, 3600), (40, 3 * 3600)])
+    assert detector.baseline == 40
+
+
+def test_poll_rate_independent():
+    """The same spike fires at fast and slow poll rates."""
+    for interval in (1.0, 5.0, 30.0):
+        detector = Pm25SpikeDetector()
+        events, _ = _feed(detector, [(10, 3600), (60, 300)], interval=interval)
+        assert len(events) == 1, interval
+        assert events[0].onset == 3600
@@ -0,0 +1,104 @@
+"""Tests for the fleet poll scheduler phases."""
+import pytest
+
+from custom_components.xiaomi_pet_purifier import polling
+from custom_components.xiaomi_pet_purifier.polling import FleetPollScheduler, _rank
+
+
+class _Timer:
+    """Timer handle that records its delay."""
+
+    def __init__(self, delay):
+        """Initialize the timer."""
+        self.delay = delay
+        self.cancelled = False
+
+    def cancel(self):
+        """Cancel the timer."""
+        self.cancelled = True
+
+
+class _Loop:
+    """Event loop that only records scheduled calls."""
+
+    def call_later(self, delay, callback, *args):
+        """Record a delayed call."""
+        return _Timer(delay)
+
+    def call_soon(self, callback, *args):
+        """Ignore a call, tests rephase explicitly."""
+
+
+class _Hass:
+    """The parts of Home Assistant the scheduler uses."""
+
+    loop = _Loop()
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    """Return a scheduler with a 30 s interval at wall clock 1000."""
+    monkeypatch.setattr(polling.time, "time", lambda: 1000.0)
+    return FleetPollScheduler(_Hass(), interval=30)
+
+
+def _add(scheduler, *entry_ids):
+    """Add purifiers and compute their phases."""
+    scheduler._coordinators.update(dict.fromkeys(entry_ids))
+    scheduler._async_rephase()
+
+
+def test_phases_are_evenly_spaced(scheduler):
+    """Purifiers get equally spaced phases in the order of their rank."""
+    entry_ids = [f"entry_{index}" for index in range(6)]
+    _add(scheduler, *entry_ids)
+
+    ordered = sorted(entry_ids, key=_rank)
+    assert [scheduler.phase(entry_id) for entry_id in ordered] == [
+        0.0,
+        5.0,
+        10.0,
+        15.0,
+        20.0,
+        25.0,
+    ]
+
+
+def test_phases_do_not_depend_on_insertion_order(scheduler):
+    """The same fleet gets the same phases however it was added."""
+    entry_ids = [f"entry_{index}" for index in range(5)]
+    _add(scheduler, *entry_ids)
+    phases = {entry_id: scheduler.phase(entry_id) for entry_id in entry_ids}
+
+    other = FleetPollScheduler(_Hass(), interval=30)
+    _add(other, *reversed(entry_ids))
+    assert {entry_id: other.phase(entry_id) for entry_id in entry_ids} == phases
+
+
+def test_first_poll_waits_for_phase(scheduler):
+    """A purifier is first polled at its next phase on the wall clock."""
+    scheduler._phases = {"entry": 25.0}
+    scheduler._async_schedule("entry")
+    # 1000 is 10 s into the interval, the phase at 25 s is 15 s away
+    assert scheduler._timers["entry"].delay == pytest.approx(15.0)
+
+
+def test_polled_purifier_skips_to_next_interval(scheduler):
+    """A timer firing early does not poll twice in one interval."""
+    scheduler._phases = {"entry": 10.5}
+    scheduler._async_schedule("entry", polled=True)
+    assert scheduler._timers["entry"].delay == pytest.approx(30.5)
+
+    scheduler._phases = {"entry": 9.5}
+    scheduler._async_schedule("entry", polled=True)
+    assert scheduler._timers["entry"].delay == pytest.approx(29.5)
+
+
+def test_rescheduling_cancels_previous_timer(scheduler):
+    """Only one poll is ever scheduled per purifier."""
+    scheduler._phases = {"entry": 0.0}
+    scheduler._async_schedule("entry")
+    timer = scheduler._timers["entry"]
+    scheduler._async_schedule("entry")
+    assert timer.cancelled
+    assert scheduler._timers["entry"] is not timer
@@ -0,0 +1,143 @@
+"""Tests for the per-device request scheduler."""
+import asyncio
+import threading
+
+from miio import DeviceException
+import pytest
+
+from custom_components.xiaomi_pet_purifier.scheduler import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    DeviceRequestScheduler,
+    SchedulerShutdown,
+)
+
+
+class _Hass:
+    """The parts of Home Assistant the scheduler uses."""
+
+    def __init__(self):
+        """Initialize on the running loop."""
+        self.loop = asyncio.get_running_loop()
+
+    def async_create_task(self, target):
+        """Schedule a coroutine."""
+        return self.loop.create_task(target)
+
+    def async_add_executor_job(self, target, *args):
+        """Run a blocking call in the default executor."""
+        return self.loop.run_in_executor(None, target, *args)
+
+
+class _Device:
+    """Records requests and holds the first one until released."""
+
+    def __init__(self):
+        """Initialize the device."""
+        self.sent = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def send(self, method, params):
+        """Answer a request."""
+        self.sent.append((method, params))
+        self.started.set()
+        self.release.wait(5)
+        if method == "fail":
+            raise DeviceException("rejected")
+        return [method, params]
+
+
+async def _busy_scheduler(device):
+    """Return a scheduler whose worker is stuck on a first request."""
+    scheduler = DeviceRequestScheduler(_Hass(), device.send)
+    first = asyncio.ensure_future(scheduler.async_request("first", None))
+    while not device.started.is_set():
+        await asyncio.sleep(0.001)
+    return scheduler, first
+
+
+def test_commands_are_sent_before_polls():
+    """Queued commands overtake queued polls, each kind in arrival order."""
+
+    async def _run():
+        device = _Device()
+        scheduler, first = await _busy_scheduler(device)
+        requests = [
+            scheduler.async_request("get_properties", ["a"], PRIORITY_POLL),
+            scheduler.async_request("set_properties", [1], PRIORITY_COMMAND),
+            scheduler.async_request("get_properties", ["b"], PRIORITY_POLL),
+            scheduler.async_request("set_properties", [2], PRIORITY_COMMAND),
+        ]
+        pending = asyncio.gather(first, *requests)
+        await asyncio.sleep(0.01)
+        assert scheduler.queue_depth == 4
+
+        device.release.set()
+        await pending
+        return device.sent
+
+    assert asyncio.run(_run()) == [
+        ("first", None),
+        ("set_properties", [1]),
+        ("set_properties", [2]),
+        ("get_properties", ["a"]),
+        ("get_properties", ["b"]),
+    ]
+
+
+def test_identical_reads_are_merged():
+    """Identical reads share one request, other reads are sent separately."""
+
+    async def _run():
+        device = _Device()
+        scheduler, first = await _busy_scheduler(device)
+        results = asyncio.gather(
+            scheduler.async_request("get_properties", [{"did": "pm25"}]),
+            scheduler.async_request("get_properties", [{"did": "pm25"}]),
+            scheduler.async_request("get_properties", [{"did": "power"}]),
+        )
+        await asyncio.sleep(0.01)
+        device.release.set()
+        await first
+        return device, scheduler, await results
+
+    device, scheduler, results = asyncio.run(_run())
+    assert results[0] == results[1] == ["get_properties", [{"did": "pm25"}]]
+    assert len(device.sent) == 3
+    assert scheduler.merged_reads == 1
+
+
+def test_device_errors_reach_the_caller():
+    """A failing request raises for its caller only."""
+
+    async def _run():
+        device = _Device()
+        device.release.set()
+        scheduler = DeviceRequestScheduler(_Hass(), device.send)
+        with pytest.raises(DeviceException):
+            await scheduler.async_request("fail", None)
+        return await scheduler.async_request("get_properties", [])
+
+    assert asyncio.run(_run()) == ["get_properties", []]
+
+
+def test_shutdown_fails_waiting_requests():
+    """Unloading fails queued requests with a device failure."""
+
+    async def _run():
+        device = _Device()
+        scheduler, first = await _busy_scheduler(device)
+        queued = asyncio.ensure_future(scheduler.async_request("set_properties", []))
+        await asyncio.sleep(0.01)
+
+        scheduler.async_shutdown()
+        for request in (first, queued):
+            with pytest.raises(SchedulerShutdown):
+                await request
+        with pytest.raises(SchedulerShutdown):
+            await scheduler.async_request("get_properties", [])
+        device.release.set()
+
+    asyncio.run(_run())
+    assert issubclass(SchedulerShutdown, DeviceException)